@@ -0,0 +1,350 @@
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from chess.board import Board
+from chess.bitboard import COLOR_INDEX, QUEEN, KING, lsb, piece_index
+from chess.attacks import is_attacked
+from chess.evaluation import evaluate
+from chess.ordering import MoveOrderer
+from chess.moves import EN_PASSANT, move_name
+from chess.tt import TranspositionTable, EXACT, LOWER, UPPER
+
+INFINITY = 32000
+MATE = 30000
+MATE_BOUND = MATE - 1000
+MAX_PLY = 64
+ASPIRATION_WINDOW = 50
+ASPIRATION_DEPTH = 4
+TIME_CHECK_INTERVAL = 1024
+
+SearchResult = namedtuple("SearchResult", "move score depth pv nodes elapsed nps")
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def score_to_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def in_check(board):
+    side = COLOR_INDEX[board.turn]
+    return is_attacked(board, lsb(board.bitboards[piece_index(KING, side)]), side ^ 1)
+
+
+def is_repetition(board):
+    key = board.key
+    history = board.history
+    for i in range(2, min(board.halfmove_clock, len(history)) + 1, 2):
+        if history[-i][7] == key:
+            return True
+    return False
+
+
+def is_capture(board, move):
+    end = move >> 6 & 63
+    return board.occupied >> end & 1 or move >> 15 == EN_PASSANT
+
+
+class Engine:
+    def __init__(self, hash_mb=16, orderer=None, tt=None, stop_event=None, book=None, tablebases=None):
+        self.tt = tt or TranspositionTable(hash_mb)
+        self.orderer = orderer or MoveOrderer()
+        self.stop_event = stop_event
+        self.book = book
+        self.book_rng = None
+        self.tablebases = tablebases
+        self.tb_hits = 0
+        self.depth_offset = 0
+        self.nodes = 0
+        self.deadline = None
+        self.soft_deadline = None
+        # ponderhit() may come from another thread before search() has set its clock;
+        # it is then kept in pending_hit and applied when the search starts.
+        self.clock_lock = threading.Lock()
+        self.searching = False
+        self.pending_hit = None
+        self.root_best = 0
+
+    def known_move(self, board):
+        # Opening book or tablebase answer for the root, if either covers it.
+        if self.book is not None:
+            move = self.book.probe(board, self.book_rng)
+            if move is not None:
+                return SearchResult(move, 0, 0, [move], 0, 0.0, 0.0)
+        if self.tablebases is not None:
+            best = self.tablebases.best_move(board)
+            if best is not None:
+                move, (wdl, plies) = best
+                return SearchResult(move, (MATE - plies) * wdl, plies, [move], 0, 0.0, 0.0)
+        return None
+
+    def search(self, board, time_limit=1.0, max_depth=MAX_PLY, callback=None):
+        start = time.perf_counter()
+        result = self.known_move(board)
+        if result is not None:
+            return result._replace(elapsed=time.perf_counter() - start)
+        with self.clock_lock:
+            if self.pending_hit is not None:
+                time_limit, self.pending_hit = self.pending_hit, None
+            self.deadline = start + time_limit if time_limit else None
+            self.soft_deadline = start + time_limit / 2 if time_limit else None
+            self.searching = True
+        self.nodes = 0
+        self.tb_hits = 0
+        self.tt.new_search()
+        self.orderer.new_search()
+
+        moves = board.legal_moves()
+        if not moves:
+            self.searching = False
+            return SearchResult(None, -MATE if in_check(board) else 0, 0, [], 0, 0.0, 0.0)
+
+        self.root_best = moves[0]
+        result = SearchResult(moves[0], 0, 0, [moves[0]], 0, 0.0, 0.0)
+        score = 0
+        history_length = len(board.history)
+        for iteration in range(1, max_depth + 1):
+            depth = min(iteration + self.depth_offset, max_depth)
+            try:
+                score = self._aspiration(board, depth, score)
+            except SearchTimeout:
+                while len(board.history) > history_length:
+                    board.unmake_move()
+                break
+
+            elapsed = time.perf_counter() - start
+            result = SearchResult(self.root_best, score, depth, self.principal_variation(board, depth),
+                                  self.nodes, elapsed, self.nodes / elapsed if elapsed else 0.0)
+            if callback:
+                callback(result)
+            if abs(score) >= MATE_BOUND or len(moves) == 1 or depth == max_depth:
+                break
+            # The next iteration costs several times this one, so don't start what can't finish.
+            if self.soft_deadline and time.perf_counter() > self.soft_deadline:
+                break
+
+        self.searching = False
+        elapsed = time.perf_counter() - start
+        return result._replace(nodes=self.nodes, elapsed=elapsed, nps=self.nodes / elapsed if elapsed else 0.0)
+
+    def ponderhit(self, time_limit):
+        # Puts a running untimed (pondering) search on the clock from now, keeping the work done so far.
+        with self.clock_lock:
+            if not self.searching:
+                self.pending_hit = time_limit
+                return
+            now = time.perf_counter()
+            self.soft_deadline = now + time_limit / 2
+            self.deadline = now + time_limit
+
+    def stats(self):
+        stats = {"nodes": self.nodes, "tb_hits": self.tb_hits}
+        stats.update({f"tt_{name}": value for name, value in self.tt.stats().items()})
+        stats.update(self.orderer.stats())
+        return stats
+
+    def principal_variation(self, board, depth):
+        pv = [self.root_best]
+        board.make_move(self.root_best)
+        seen = {board.key}
+        while len(pv) < depth:
+            entry = self.tt.probe(board.key)
+            if entry is None or entry[3] not in board.legal_moves():
+                break
+            board.make_move(entry[3])
+            pv.append(entry[3])
+            if board.key in seen:
+                break
+            seen.add(board.key)
+        for _ in pv:
+            board.unmake_move()
+        return pv
+
+    def _aspiration(self, board, depth, guess):
+        if depth < ASPIRATION_DEPTH:
+            return self._negamax(board, depth, -INFINITY, INFINITY, 0)
+        delta = ASPIRATION_WINDOW
+        alpha, beta = max(guess - delta, -INFINITY), min(guess + delta, INFINITY)
+        while True:
+            score = self._negamax(board, depth, alpha, beta, 0)
+            if score <= alpha:
+                alpha = max(score - delta, -INFINITY)
+            elif score >= beta:
+                beta = min(score + delta, INFINITY)
+            else:
+                return score
+            delta *= 2
+
+    def _check_time(self):
+        if self.deadline and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes % TIME_CHECK_INTERVAL:
+            self._check_time()
+        if ply and (board.halfmove_clock >= 100 or is_repetition(board)):
+            return 0
+        if ply and self.tablebases is not None:
+            entry = self.tablebases.probe(board)
+            if entry is not None:
+                self.tb_hits += 1
+                wdl, plies = entry
+                return (MATE - ply - plies) * wdl
+
+        checked = in_check(board)
+        if checked:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiescence(board, alpha, beta, ply)
+
+        key = board.key
+        original_alpha = alpha
+        tt_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            entry_depth, entry_score, bound, tt_move = entry
+            if ply and entry_depth >= depth:
+                entry_score = score_from_tt(entry_score, ply)
+                if bound == EXACT:
+                    return entry_score
+                if bound == LOWER and entry_score >= beta:
+                    return entry_score
+                if bound == UPPER and entry_score <= alpha:
+                    return entry_score
+
+        moves = board.legal_moves()
+        if not moves:
+            return -MATE + ply if checked else 0
+
+        best_score = -INFINITY
+        best_move = 0
+        for index, move in enumerate(self.orderer.order(board, moves, tt_move, ply)):
+            board.make_move(move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if ply == 0:
+                        self.root_best = move
+                    if alpha >= beta:
+                        self.orderer.record_cutoff(board, move, depth, ply, index)
+                        break
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(key, depth, score_to_tt(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiescence(self, board, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes % TIME_CHECK_INTERVAL:
+            self._check_time()
+
+        checked = in_check(board)
+        moves = board.legal_moves()
+        if checked:
+            if not moves:
+                return -MATE + ply
+            best_score = -INFINITY
+        else:
+            best_score = evaluate(board)
+            if best_score >= beta or ply >= MAX_PLY:
+                return best_score
+            if best_score > alpha:
+                alpha = best_score
+            moves = self.orderer.order_captures(
+                board, [move for move in moves if is_capture(board, move) or move >> 12 & 7 == QUEEN])
+
+        if checked:
+            moves = self.orderer.order(board, moves, 0, ply)
+        for move in moves:
+            board.make_move(move)
+            score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+
+def print_info(result):
+    print(f"depth {result.depth}  score {result.score}  nodes {result.nodes}  "
+          f"nps {result.nps:,.0f}  pv {' '.join(move_name(move) for move in result.pv)}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.ai", description="Search a position and report speed.")
+    parser.add_argument("--fen", default=None)
+    parser.add_argument("--time", type=float, default=5.0, help="seconds per move")
+    parser.add_argument("--depth", type=int, default=MAX_PLY)
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size in MB")
+    parser.add_argument("--workers", type=int, default=1, help="Lazy SMP search processes sharing the hash table")
+    parser.add_argument("--book", default=None, help="opening book to probe before searching")
+    parser.add_argument("--tablebases", default=None, help="directory of endgame tables to probe")
+    parser.add_argument("--plain-ordering", action="store_true",
+                        help="order by MVV-LVA only, without SEE, killers or history")
+    args = parser.parse_args(argv)
+
+    board = Board.from_fen(args.fen) if args.fen else Board()
+    if not args.fen:
+        board.setup()
+    book = None
+    if args.book:
+        from chess.book import Book
+        book = Book(args.book)
+    tablebases = None
+    if args.tablebases:
+        from chess.tablebase import Tablebases
+        tablebases = Tablebases(args.tablebases)
+    if args.workers > 1:
+        from chess.parallel import ParallelSearch
+        with ParallelSearch(args.workers, args.hash, book, tablebases) as search:
+            result = search.search(board, args.time, args.depth, callback=print_info)
+        print(f"bestmove {move_name(result.move) if result.move else '(none)'}  "
+              f"nodes {result.nodes}  time {result.elapsed:.2f}s  nps {result.nps:,.0f}  workers {args.workers}")
+        return 0
+
+    orderer = MoveOrderer(killers=False, history=False, use_see=False) if args.plain_ordering else None
+    engine = Engine(args.hash, orderer, book=book, tablebases=tablebases)
+    result = engine.search(board, args.time, args.depth, callback=print_info)
+    print(f"bestmove {move_name(result.move) if result.move else '(none)'}  "
+          f"nodes {result.nodes}  time {result.elapsed:.2f}s  nps {result.nps:,.0f}")
+    stats = engine.stats()
+    print(f"tt hit rate {stats['tt_hit_rate']:.1%}  first-move cutoffs {stats['first_move_cutoff_rate']:.1%}  "
+          f"see pruned {stats['see_pruned']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
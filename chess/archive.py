@@ -0,0 +1,216 @@
+import mmap
+import os
+import shutil
+import struct
+
+from chess.board import Board
+from chess.bitboard import WHITE, COLORS, iter_bits
+from chess.pieces import PIECES
+from chess.zobrist import compute_key
+
+# A packed position is 36 bytes: one nibble per square (0 = empty, piece code + 1), then
+# castling rights | en-passant file + 1 << 4, the halfmove clock, and fullmove number << 1 | side.
+POSITION_SIZE = 36
+TRAILER = struct.Struct("<BBH")
+
+# Archive layout: MAGIC, the packed positions back to back, then one uint64
+# start index per game, then a footer holding the index offset and game count.
+MAGIC = b"CHSARC1\0"
+FOOTER = struct.Struct("<QQ")
+INDEX_ENTRY = struct.Struct("<Q")
+
+DEFAULT_SAVE_PATH = "saved_games.chsa"
+
+
+def pack_position(board):
+    data = bytearray(POSITION_SIZE)
+    for code, bb in enumerate(board.bitboards):
+        for sq in iter_bits(bb):
+            data[sq >> 1] |= (code + 1) << ((sq & 1) << 2)
+    flags = board.castling | (0 if board.en_passant is None else (board.en_passant & 7) + 1) << 4
+    moves = min(board.fullmove_number, 0x7fff) << 1 | (board.turn != "white")
+    TRAILER.pack_into(data, 32, flags, min(board.halfmove_clock, 255), moves)
+    return bytes(data)
+
+
+def unpack_position(data, board=None):
+    board = board or Board()
+    board.clear()
+    for index in range(32):
+        byte = data[index]
+        if byte & 15:
+            board._put(index << 1, PIECES[(byte & 15) - 1])
+        if byte >> 4:
+            board._put(index << 1 | 1, PIECES[(byte >> 4) - 1])
+    flags, halfmove, moves = TRAILER.unpack_from(data, 32)
+    board.turn = COLORS[moves & 1]
+    board.castling = flags & 15
+    if flags >> 4:
+        # The capture square is on the sixth rank from the mover's side.
+        board.en_passant = (16 if moves & 1 == WHITE else 40) + (flags >> 4) - 1
+    board.halfmove_clock = halfmove
+    board.fullmove_number = moves >> 1
+    board.unmoved = board.home_squares()
+    board.key = compute_key(board)
+    return board
+
+
+def game_positions(board):
+    # The game's positions from the first to the current one, recovered by unmaking a copy.
+    replay = board.copy()
+    replay.history = list(board.history)
+    positions = [pack_position(replay)]
+    while replay.history:
+        replay.unmake_move()
+        positions.append(pack_position(replay))
+    positions.reverse()
+    return positions
+
+
+def restore_game(positions):
+    # Rebuilds a board whose undo history leads through the stored positions. A
+    # position no legal move reaches restarts the history there, so the board still
+    # ends on the last stored position.
+    board = unpack_position(positions[0])
+    for packed in positions[1:]:
+        for move in board.legal_moves():
+            board.make_move(move)
+            if pack_position(board) == packed:
+                break
+            board.unmake_move()
+        else:
+            board = unpack_position(packed)
+    return board
+
+
+class ArchiveWriter:
+    # Writes into a temporary file that replaces `path` on close(), so the existing
+    # archive stays readable until the new one is complete. Appending copies the old
+    # positions across and leaves their index to be rewritten after the new games.
+
+    def __init__(self, path, append=True):
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.starts = []
+        end = None
+        if append and os.path.exists(path) and os.path.getsize(path) > len(MAGIC):
+            with Archive(path) as archive:
+                self.starts = list(archive.starts)
+                end = len(MAGIC) + archive.count * POSITION_SIZE
+        self.file = open(self.temp_path, "wb")
+        if end is not None:
+            # Copied in chunks, then the old index is cut off the end.
+            with open(path, "rb") as source:
+                shutil.copyfileobj(source, self.file)
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.file.write(MAGIC)
+        self.count = (self.file.tell() - len(MAGIC)) // POSITION_SIZE
+
+    def add_game(self, positions):
+        self.starts.append(self.count)
+        for packed in positions:
+            self.file.write(packed)
+        self.count += len(positions)
+        return len(self.starts) - 1
+
+    def add_board(self, board):
+        return self.add_game([pack_position(board)])
+
+    def close(self):
+        if self.file is None:
+            return
+        index_offset = self.file.tell()
+        for start in self.starts:
+            self.file.write(INDEX_ENTRY.pack(start))
+        self.file.write(FOOTER.pack(index_offset, len(self.starts)))
+        self.file.close()
+        self.file = None
+        os.replace(self.temp_path, self.path)
+
+    def discard(self):
+        # Drops everything written since opening; the archive on disk is unchanged.
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, *exc):
+        if kind is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class Archive:
+    # Read-only view of an archive through mmap: positions are sliced straight out of
+    # the mapped file, so opening is O(games) and lookups never parse the rest.
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC or len(self.map) < len(MAGIC) + FOOTER.size:
+            self.close()
+            raise ValueError(f"not a position archive: {path}")
+        index_offset, games = FOOTER.unpack_from(self.map, len(self.map) - FOOTER.size)
+        if index_offset < len(MAGIC) or index_offset + games * INDEX_ENTRY.size > len(self.map) - FOOTER.size:
+            self.close()
+            raise ValueError(f"corrupt position archive: {path}")
+        self.count = (index_offset - len(MAGIC)) // POSITION_SIZE
+        self.starts = [start for start, in INDEX_ENTRY.iter_unpack(
+            self.map[index_offset:index_offset + games * INDEX_ENTRY.size])]
+
+    def __len__(self):
+        return self.count
+
+    def raw(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        offset = len(MAGIC) + index * POSITION_SIZE
+        return self.map[offset:offset + POSITION_SIZE]
+
+    def __getitem__(self, index):
+        return unpack_position(self.raw(index if index >= 0 else self.count + index))
+
+    def scan(self):
+        # Raw records in file order, without unpacking.
+        for offset in range(len(MAGIC), len(MAGIC) + self.count * POSITION_SIZE, POSITION_SIZE):
+            yield self.map[offset:offset + POSITION_SIZE]
+
+    def games(self):
+        return len(self.starts)
+
+    def game(self, number):
+        if number < 0:
+            number += len(self.starts)
+        start = self.starts[number]
+        end = self.starts[number + 1] if number + 1 < len(self.starts) else self.count
+        return [self.raw(index) for index in range(start, end)]
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_game(board, path=DEFAULT_SAVE_PATH):
+    with ArchiveWriter(path) as writer:
+        return writer.add_game(game_positions(board))
+
+
+def load_game(path=DEFAULT_SAVE_PATH, number=-1):
+    with Archive(path) as archive:
+        if not archive.games():
+            return None
+        return restore_game(archive.game(number))
@@ -0,0 +1,75 @@
+from chess.bitboard import BISHOP, ROOK, QUEEN, KING, lsb, iter_bits
+
+
+class AttackMap:
+    # Attack information kept in step with a Board as pieces are put and taken:
+    #   attacks[sq]      squares attacked by the piece standing on sq
+    #   attacked_by[sq]  squares whose pieces attack sq (either colour)
+    #   counts[side][sq] how many of side's pieces attack sq
+    #   attacked[side]   bitboard of squares side attacks at least once
+    # A change on one square only recomputes that piece and the sliders whose rays reach it.
+
+    __slots__ = ("board", "attacks", "attacked_by", "counts", "attacked")
+
+    def __init__(self, board):
+        self.board = board
+        self.attacks = [0] * 64
+        self.attacked_by = [0] * 64
+        self.counts = [[0] * 64, [0] * 64]
+        self.attacked = [0, 0]
+        squares = board.board
+        occupied = board.occupied
+        for sq in iter_bits(occupied):
+            piece = squares[sq >> 3][sq & 7]
+            self._assign(sq, piece.side, piece.attacks(sq, occupied))
+
+    def _assign(self, sq, side, new):
+        old = self.attacks[sq]
+        if old == new:
+            return
+        self.attacks[sq] = new
+        bit = 1 << sq
+        attacked_by = self.attacked_by
+        counts = self.counts[side]
+        for target in iter_bits(old & ~new):
+            attacked_by[target] ^= bit
+            counts[target] -= 1
+            if not counts[target]:
+                self.attacked[side] ^= 1 << target
+        for target in iter_bits(new & ~old):
+            attacked_by[target] |= bit
+            counts[target] += 1
+            if counts[target] == 1:
+                self.attacked[side] |= 1 << target
+
+    def _refresh_sliders(self, sq):
+        board = self.board
+        bitboards = board.bitboards
+        sliders = (bitboards[BISHOP] | bitboards[ROOK] | bitboards[QUEEN]
+                   | bitboards[BISHOP + 6] | bitboards[ROOK + 6] | bitboards[QUEEN + 6])
+        squares = board.board
+        occupied = board.occupied
+        for source in iter_bits(self.attacked_by[sq] & sliders):
+            piece = squares[source >> 3][source & 7]
+            self._assign(source, piece.side, piece.attacks(source, occupied))
+
+    def put(self, sq, piece):
+        self._assign(sq, piece.side, piece.attacks(sq, self.board.occupied))
+        self._refresh_sliders(sq)
+
+    def take(self, sq, piece):
+        self._assign(sq, piece.side, 0)
+        self._refresh_sliders(sq)
+
+    def is_attacked(self, sq, side):
+        return self.attacked[side] >> sq & 1
+
+    def attackers(self, sq, side):
+        return self.attacked_by[sq] & self.board.occupancy[side]
+
+    def checkers(self, side):
+        # Pieces giving check to side's king.
+        kings = self.board.bitboards[KING + 6 * side]
+        if not kings:
+            return 0
+        return self.attackers(lsb(kings), side ^ 1)
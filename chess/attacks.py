@@ -0,0 +1,122 @@
+from chess.bitboard import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, lsb, msb
+
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+KNIGHT_OFFSETS = [(-2, -1), (-2, 1), (2, -1), (2, 1), (-1, -2), (1, -2), (-1, 2), (1, 2)]
+KING_OFFSETS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def _leaper_table(offsets):
+    table = []
+    for sq in range(64):
+        row, col = sq >> 3, sq & 7
+        bb = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                bb |= 1 << (r * 8 + c)
+        table.append(bb)
+    return table
+
+
+def _ray_table(dr, dc):
+    table = []
+    for sq in range(64):
+        r, c = (sq >> 3) + dr, (sq & 7) + dc
+        bb = 0
+        while 0 <= r < 8 and 0 <= c < 8:
+            bb |= 1 << (r * 8 + c)
+            r, c = r + dr, c + dc
+        table.append(bb)
+    return table
+
+
+KNIGHT_ATTACKS = _leaper_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _leaper_table(KING_OFFSETS)
+PAWN_ATTACKS = [_leaper_table([(-1, -1), (-1, 1)]), _leaper_table([(1, -1), (1, 1)])]
+
+# Rays heading towards higher square indices stop at their lowest blocker,
+# the others at their highest one.
+ROOK_RAYS = [(_ray_table(dr, dc), dr * 8 + dc > 0) for dr, dc in ROOK_DIRECTIONS]
+BISHOP_RAYS = [(_ray_table(dr, dc), dr * 8 + dc > 0) for dr, dc in BISHOP_DIRECTIONS]
+
+
+def _slider_attacks(rays, sq, occupied):
+    attacks = 0
+    for table, positive in rays:
+        ray = table[sq]
+        blockers = ray & occupied
+        if blockers:
+            blocker = lsb(blockers) if positive else msb(blockers)
+            ray ^= table[blocker]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq, occupied):
+    return _slider_attacks(ROOK_RAYS, sq, occupied)
+
+
+def bishop_attacks(sq, occupied):
+    return _slider_attacks(BISHOP_RAYS, sq, occupied)
+
+
+def queen_attacks(sq, occupied):
+    return _slider_attacks(ROOK_RAYS, sq, occupied) | _slider_attacks(BISHOP_RAYS, sq, occupied)
+
+
+def attackers_to(board, sq, side, occupied=None):
+    if occupied is None:
+        occupied = board.occupied
+    bitboards = board.bitboards
+    offset = 6 * side
+    queens = bitboards[QUEEN + offset]
+    return ((PAWN_ATTACKS[side ^ 1][sq] & bitboards[PAWN + offset])
+            | (KNIGHT_ATTACKS[sq] & bitboards[KNIGHT + offset])
+            | (KING_ATTACKS[sq] & bitboards[KING + offset])
+            | (bishop_attacks(sq, occupied) & (bitboards[BISHOP + offset] | queens))
+            | (rook_attacks(sq, occupied) & (bitboards[ROOK + offset] | queens))) & occupied
+
+
+def is_attacked(board, sq, side, occupied=None):
+    if occupied is None:
+        occupied = board.occupied
+    bitboards = board.bitboards
+    offset = 6 * side
+    if PAWN_ATTACKS[side ^ 1][sq] & bitboards[PAWN + offset]:
+        return True
+    if KNIGHT_ATTACKS[sq] & bitboards[KNIGHT + offset]:
+        return True
+    if KING_ATTACKS[sq] & bitboards[KING + offset]:
+        return True
+    queens = bitboards[QUEEN + offset]
+    diagonal = (bitboards[BISHOP + offset] | queens) & occupied
+    if diagonal and bishop_attacks(sq, occupied) & diagonal:
+        return True
+    straight = (bitboards[ROOK + offset] | queens) & occupied
+    if straight and rook_attacks(sq, occupied) & straight:
+        return True
+    return False
+
+
+def _line_tables():
+    rays = {(dr, dc): _ray_table(dr, dc) for dr, dc in KING_OFFSETS}
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for sq in range(64):
+        for dr, dc in KING_OFFSETS:
+            full = rays[dr, dc][sq] | rays[-dr, -dc][sq] | 1 << sq
+            r, c = (sq >> 3) + dr, (sq & 7) + dc
+            path = 0
+            while 0 <= r < 8 and 0 <= c < 8:
+                target = r * 8 + c
+                between[sq][target] = path
+                line[sq][target] = full
+                path |= 1 << target
+                r, c = r + dr, c + dc
+    return between, line
+
+
+# BETWEEN holds the squares strictly between two aligned squares, LINE the
+# whole rank, file or diagonal through them; both are empty otherwise.
+BETWEEN, LINE = _line_tables()
@@ -0,0 +1,87 @@
+import threading
+
+from chess.ai import Engine, MAX_PLY
+
+# The search runs in a daemon thread on its own copy of the board. Python's
+# thread switch interval hands the GIL back to the caller every few
+# milliseconds, so a GUI loop keeps drawing while the engine thinks.
+
+
+class SearchHandle:
+    def __init__(self, engine, board, time_limit, max_depth, callback=None):
+        self.stop_event = threading.Event()
+        self.key = board.key
+        self.callback = callback
+        self.progress = None
+        self._result = None
+        engine.stop_event = self.stop_event
+        # A ponder hit meant for an earlier search must not put this one on the clock.
+        engine.pending_hit = None
+        self.thread = threading.Thread(target=self._run, args=(engine, board, time_limit, max_depth), daemon=True)
+        self.thread.start()
+
+    def _run(self, engine, board, time_limit, max_depth):
+        self._result = engine.search(board, time_limit, max_depth, callback=self._report)
+
+    def _report(self, result):
+        # Called from the search thread after every completed iteration.
+        self.progress = result
+        if self.callback is not None:
+            self.callback(result)
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def result(self, timeout=None):
+        self.thread.join(timeout)
+        return self._result
+
+    def cancel(self):
+        # Stops at the next time check; the best move found so far is still returned by result().
+        self.stop_event.set()
+        self.thread.join()
+        return self._result
+
+
+class BackgroundEngine:
+    # think() searches for the side to move; after the engine has moved, ponder()
+    # searches the position behind the reply it expects. If that reply is played,
+    # think() keeps the running search and only starts its clock (a ponder hit);
+    # otherwise the ponder search is dropped and the warm hash table is all that's reused.
+
+    def __init__(self, engine=None, time_limit=1.0, max_depth=MAX_PLY, callback=None):
+        self.engine = engine or Engine()
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.callback = callback
+        self.handle = None
+        self.pondering = None
+        self.ponder_hits = 0
+
+    def think(self, board):
+        if self.handle is not None and self.pondering == board.key:
+            self.pondering = None
+            self.ponder_hits += 1
+            self.engine.ponderhit(self.time_limit)
+            return self.handle
+        self.stop()
+        self.handle = SearchHandle(self.engine, board.copy(history=True), self.time_limit, self.max_depth,
+                                   self.callback)
+        return self.handle
+
+    def ponder(self, board, pv):
+        # pv is the engine's last principal variation, starting with the move it just played on board.
+        self.stop()
+        if len(pv) < 2 or pv[1] not in board.legal_moves():
+            return None
+        expected = board.copy(history=True)
+        expected.make_move(pv[1])
+        self.pondering = expected.key
+        self.handle = SearchHandle(self.engine, expected, 0, self.max_depth, self.callback)
+        return self.handle
+
+    def stop(self):
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        self.pondering = None
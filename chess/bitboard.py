@@ -0,0 +1,43 @@
+WHITE, BLACK = 0, 1
+COLORS = ("white", "black")
+COLOR_INDEX = {"white": WHITE, "black": BLACK}
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+EMPTY = 0
+FULL = (1 << 64) - 1
+
+
+def square(row, col):
+    return row * 8 + col
+
+
+def row_col(sq):
+    return sq >> 3, sq & 7
+
+
+def bit(sq):
+    return 1 << sq
+
+
+def lsb(bb):
+    return (bb & -bb).bit_length() - 1
+
+
+def msb(bb):
+    return bb.bit_length() - 1
+
+
+def popcount(bb):
+    return bin(bb).count("1")
+
+
+def iter_bits(bb):
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def piece_index(kind, side):
+    return kind + 6 * side
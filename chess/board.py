@@ -1,38 +1,169 @@
-from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King
+from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King, PIECES, PIECE_SYMBOLS
+from chess.utils import opponent
+from chess.bitboard import (COLOR_INDEX, WHITE, BLACK, PAWN, ROOK, QUEEN, KING, square, row_col, lsb, iter_bits,
+                            piece_index, popcount)
+from chess.moves import EN_PASSANT, CASTLING, square_name
+from chess.movegen import CASTLING_MASK, CASTLING_SQUARES, generate_legal_moves
+from chess.attacks import PAWN_ATTACKS
+from chess.attackmap import AttackMap
+from chess.zobrist import PIECE_KEYS, CASTLING_KEYS, EN_PASSANT_KEYS, SIDE_KEY, compute_key
 
 class Board:
     def __init__(self):
-        self.board = [[None] * 8 for _ in range(8)]
+        self.clear()
 
     def reset(self):
-        self.board = [[None for _ in range(8)] for _ in range(8)]
         self.setup()
 
+    def clear(self):
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.bitboards = [0] * 12
+        self.occupancy = [0, 0]
+        self.occupied = 0
+        # Squares whose piece has not moved since setup; replaces per-piece has_moved flags.
+        self.unmoved = 0
+        self.turn = "white"
+        self.history = []
+        self.castling = 0
+        self.en_passant = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.key = 0
+        self.attack_map = None
+
     def setup(self):
+        self.clear()
         for col in range(8):
-            self.board[1][col] = Pawn("black")
-            self.board[6][col] = Pawn("white")
+            self.place_piece((1, col), Pawn("black"))
+            self.place_piece((6, col), Pawn("white"))
+
+        self.place_piece((0, 0), Rook("black"))
+        self.place_piece((0, 7), Rook("black"))
+        self.place_piece((7, 0), Rook("white"))
+        self.place_piece((7, 7), Rook("white"))
+
+        self.place_piece((0, 1), Knight("black"))
+        self.place_piece((0, 6), Knight("black"))
+        self.place_piece((7, 1), Knight("white"))
+        self.place_piece((7, 6), Knight("white"))
+
+        self.place_piece((0, 2), Bishop("black"))
+        self.place_piece((0, 5), Bishop("black"))
+        self.place_piece((7, 2), Bishop("white"))
+        self.place_piece((7, 5), Bishop("white"))
+
+        self.place_piece((0, 3), Queen("black"))
+        self.place_piece((7, 3), Queen("white"))
+
+        self.place_piece((0, 4), King("black"))
+        self.place_piece((7, 4), King("white"))
+        self.castling = 15
+        self.unmoved = self.occupied
+        self.key = compute_key(self)
 
-        self.board[0][0] = Rook("black")
-        self.board[0][7] = Rook("black")
-        self.board[7][0] = Rook("white")
-        self.board[7][7] = Rook("white")
+    def set_fen(self, fen):
+        fields = fen.split()
+        if not fields:
+            raise ValueError("empty FEN")
+        fields += ["w", "-", "-", "0", "1"][len(fields) - 1:]
+        placement, turn, castling, en_passant, halfmove, fullmove = fields[:6]
+        ranks = placement.split("/")
+        if len(ranks) != 8 or turn not in ("w", "b"):
+            raise ValueError(f"invalid FEN: {fen}")
 
-        self.board[0][1] = Knight("black")
-        self.board[0][6] = Knight("black")
-        self.board[7][1] = Knight("white")
-        self.board[7][6] = Knight("white")
+        self.clear()
+        for row, rank in enumerate(ranks):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                    continue
+                piece_type = PIECE_SYMBOLS.get(char.lower())
+                if piece_type is None or col > 7:
+                    raise ValueError(f"invalid FEN: {fen}")
+                piece = piece_type("white" if char.isupper() else "black")
+                self.place_piece((row, col), piece)
+                col += 1
+            if col != 8:
+                raise ValueError(f"invalid FEN: {fen}")
+        # One king a side and no pawns on the back ranks, or move generation breaks.
+        pawns = self.bitboards[piece_index(PAWN, WHITE)] | self.bitboards[piece_index(PAWN, BLACK)]
+        if (popcount(self.bitboards[piece_index(KING, WHITE)]) != 1
+                or popcount(self.bitboards[piece_index(KING, BLACK)]) != 1 or pawns & (0xff | 0xff << 56)):
+            raise ValueError(f"invalid FEN: {fen}")
 
-        self.board[0][2] = Bishop("black")
-        self.board[0][5] = Bishop("black")
-        self.board[7][2] = Bishop("white")
-        self.board[7][5] = Bishop("white")
+        self.turn = "white" if turn == "w" else "black"
+        self.castling = 0
+        for char, right in zip("KQkq", (1, 2, 4, 8)):
+            # A right only stands with its king and rook still on their home squares.
+            side = WHITE if char.isupper() else BLACK
+            king = 1 << (60 if side == WHITE else 4)
+            rook = CASTLING_SQUARES[right] ^ king
+            if (char in castling and self.bitboards[piece_index(KING, side)] & king
+                    and self.bitboards[piece_index(ROOK, side)] & rook):
+                self.castling |= right
+        if en_passant != "-":
+            row, col = self._convert_position(en_passant)
+            ep = square(row, col)
+            side = COLOR_INDEX[self.turn]
+            if PAWN_ATTACKS[side ^ 1][ep] & self.bitboards[piece_index(PAWN, side)]:
+                self.en_passant = ep
+        self.halfmove_clock = int(halfmove)
+        self.fullmove_number = int(fullmove)
+        self.unmoved = self.home_squares()
+        self.key = compute_key(self)
+        return self
 
-        self.board[0][3] = Queen("black")
-        self.board[7][3] = Queen("white")
+    def home_squares(self):
+        # Best guess at unmoved pieces for a position without history: pawns on
+        # their home rank, plus the king and rooks that still have castling rights.
+        unmoved = (self.bitboards[piece_index(PAWN, WHITE)] & 0xff << 48
+                   | self.bitboards[piece_index(PAWN, BLACK)] & 0xff << 8)
+        for right, squares in CASTLING_SQUARES.items():
+            if self.castling & right:
+                unmoved |= self.occupied & squares
+        return unmoved
 
-        self.board[0][4] = King("black")
-        self.board[7][4] = King("white")
+    def fen(self):
+        ranks = []
+        for row in self.board:
+            rank = ""
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += piece.symbol.upper() if piece.side == WHITE else piece.symbol
+            ranks.append(rank + str(empty) if empty else rank)
+        castling = "".join(char for char, right in zip("KQkq", (1, 2, 4, 8)) if self.castling & right) or "-"
+        en_passant = "-" if self.en_passant is None else square_name(self.en_passant)
+        return (f"{'/'.join(ranks)} {self.turn[0]} {castling} {en_passant} "
+                f"{self.halfmove_clock} {self.fullmove_number}")
+
+    @classmethod
+    def from_fen(cls, fen):
+        return cls().set_fen(fen)
+
+    def copy(self, history=False):
+        # history=True also copies the undo records repetition detection can still reach.
+        other = Board()
+        other.board = [row[:] for row in self.board]
+        other.bitboards = self.bitboards[:]
+        other.occupancy = self.occupancy[:]
+        other.occupied = self.occupied
+        other.unmoved = self.unmoved
+        other.turn = self.turn
+        other.castling = self.castling
+        other.en_passant = self.en_passant
+        other.halfmove_clock = self.halfmove_clock
+        other.fullmove_number = self.fullmove_number
+        other.key = self.key
+        if history:
+            other.history = self.history[max(0, len(self.history) - self.halfmove_clock):]
+        return other
 
     def display(self):
         for row in self.board:
@@ -40,11 +171,10 @@ class Board:
 
     def apply_move(self, move):
         start, end = move.split()
-        start_row, start_col = self._convert_position(start)
-        end_row, end_col = self._convert_position(end)
-
-        self.board[end_row][end_col] = self.board[start_row][start_col]
-        self.board[start_row][start_col] = None
+        legal = self.find_move(self._convert_position(start), self._convert_position(end))
+        if legal is None:
+            raise ValueError(f"illegal move: {move}")
+        return self.make_move(legal)
 
     def _convert_position(self, pos):
         col = ord(pos[0].lower()) - ord('a')
@@ -55,15 +185,150 @@ class Board:
         row, col = position
         return self.board[row][col]
 
+    def _put(self, sq, piece):
+        mask = 1 << sq
+        self.board[sq >> 3][sq & 7] = piece
+        self.bitboards[piece.code] |= mask
+        self.occupancy[piece.side] |= mask
+        self.occupied |= mask
+        self.key ^= PIECE_KEYS[piece.code][sq]
+        if self.attack_map is not None:
+            self.attack_map.put(sq, piece)
+
+    def _take(self, sq):
+        piece = self.board[sq >> 3][sq & 7]
+        if piece is None:
+            return None
+        mask = ~(1 << sq)
+        self.board[sq >> 3][sq & 7] = None
+        self.bitboards[piece.code] &= mask
+        self.occupancy[piece.side] &= mask
+        self.occupied &= mask
+        self.key ^= PIECE_KEYS[piece.code][sq]
+        if self.attack_map is not None:
+            self.attack_map.take(sq, piece)
+        return piece
+
+    def place_piece(self, position, piece):
+        sq = square(*position)
+        self._take(sq)
+        self._put(sq, piece)
+        self.unmoved &= ~(1 << sq)
+
+    def remove_piece(self, position):
+        return self._take(square(*position))
+
     def move_piece(self, start, end):
-        piece = self.board[start[0]][start[1]]
-        self.board[end[0]][end[1]] = piece
-        self.board[start[0]][start[1]] = None
+        piece = self.remove_piece(start)
+        if piece is not None:
+            self.place_piece(end, piece)
 
-    def find_king(self, color):
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if isinstance(piece, King) and piece.color == color:
-                    return (row, col)
+    def make_move(self, move):
+        start, end, flag = move & 63, move >> 6 & 63, move >> 15
+        key = self.key
+        piece = self._take(start)
+        captured_sq = end
+        if flag == EN_PASSANT:
+            captured_sq = end + 8 if piece.side == WHITE else end - 8
+        captured = self._take(captured_sq)
+        unmoved = self.unmoved
+        self.unmoved &= ~(1 << start | 1 << end)
+
+        promotion = move >> 12 & 7
+        self._put(end, PIECES[promotion + 6 * piece.side] if promotion else piece)
+        if flag == CASTLING:
+            rook_start, rook_end = (start + 3, start + 1) if end > start else (start - 4, start - 1)
+            self._put(rook_end, self._take(rook_start))
+            self.unmoved &= ~(1 << rook_start)
+
+        record = (move, piece, captured, unmoved, self.castling, self.en_passant, self.halfmove_clock, key)
+        castling = self.castling & CASTLING_MASK[start] & CASTLING_MASK[end]
+        if castling != self.castling:
+            self.key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+            self.castling = castling
+        if self.en_passant is not None:
+            self.key ^= EN_PASSANT_KEYS[self.en_passant & 7]
+            self.en_passant = None
+        if piece.kind == PAWN:
+            self.halfmove_clock = 0
+            # Only record the en-passant square when a capture is really possible,
+            # so that transpositions keep the same key.
+            if end - start in (16, -16):
+                ep = (start + end) >> 1
+                if PAWN_ATTACKS[piece.side][ep] & self.bitboards[piece_index(PAWN, piece.side ^ 1)]:
+                    self.en_passant = ep
+                    self.key ^= EN_PASSANT_KEYS[ep & 7]
+        elif captured is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if piece.side != WHITE:
+            self.fullmove_number += 1
+
+        self.turn = opponent(self.turn)
+        self.key ^= SIDE_KEY
+        self.history.append(record)
+        return record
+
+    def unmake_move(self, record=None):
+        last = self.history.pop()
+        if record is not None and record is not last:
+            self.history.append(last)
+            raise ValueError("only the most recent move can be unmade")
+        move, piece, captured, self.unmoved, self.castling, self.en_passant, self.halfmove_clock, key = last
+        start, end, flag = move & 63, move >> 6 & 63, move >> 15
+
+        self._take(end)
+        self._put(start, piece)
+        if captured is not None:
+            captured_sq = end
+            if flag == EN_PASSANT:
+                captured_sq = end + 8 if piece.side == WHITE else end - 8
+            self._put(captured_sq, captured)
+        if flag == CASTLING:
+            rook_start, rook_end = (start + 3, start + 1) if end > start else (start - 4, start - 1)
+            self._put(rook_start, self._take(rook_end))
+        if piece.side != WHITE:
+            self.fullmove_number -= 1
+
+        self.turn = opponent(self.turn)
+        self.key = key
+        return move
+
+    def track_attacks(self):
+        # The AttackMap is built on first use and then updated by every _put/_take;
+        # boards that never ask (copies handed to the search) don't pay for it.
+        if self.attack_map is None:
+            self.attack_map = AttackMap(self)
+        return self.attack_map
+
+    def legal_moves(self, color=None):
+        return generate_legal_moves(self, COLOR_INDEX[color or self.turn])
+
+    def find_move(self, start, end, promotion=QUEEN):
+        start, end = square(*start), square(*end)
+        for move in self.legal_moves():
+            if move & 63 == start and move >> 6 & 63 == end and move >> 12 & 7 in (0, promotion):
+                return move
         return None
+
+    def legal_targets(self, position):
+        start = square(*position)
+        return [row_col(move >> 6 & 63) for move in self.legal_moves() if move & 63 == start]
+
+    def has_moved(self, position):
+        return not self.unmoved >> square(*position) & 1
+
+    def is_empty(self, position):
+        return not self.occupied >> square(*position) & 1
+
+    def pieces(self, color, kind=None):
+        side = COLOR_INDEX[color]
+        bb = self.occupancy[side] if kind is None else self.bitboards[piece_index(kind, side)]
+        return [row_col(sq) for sq in iter_bits(bb)]
+
+    def find_king(self, color):
+        kings = self.bitboards[piece_index(KING, COLOR_INDEX[color])]
+        if not kings:
+            return None
+        return row_col(lsb(kings))
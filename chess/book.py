@@ -0,0 +1,154 @@
+import mmap
+import os
+import struct
+import sys
+
+from chess.moves import CASTLING, move_name
+from chess.pgn import read_games, replay
+
+# Polyglot's 16-byte big-endian entry layout: key, move, weight, learn.
+# Keys are this engine's own Zobrist keys, so books are not interchangeable
+# with Polyglot .bin files built from the standard Polyglot key table.
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+MAX_WEIGHT = 0xffff
+DEFAULT_BOOK_PATH = "book.bin"
+
+
+def polyglot_move(move):
+    # Polyglot counts ranks from rank 1 and encodes castling as "king takes own rook".
+    start, end = move & 63, move >> 6 & 63
+    if move >> 15 == CASTLING:
+        end = start + 3 if end > start else start - 4
+    return ((end & 7) | (7 - (end >> 3)) << 3 | (start & 7) << 6 | (7 - (start >> 3)) << 9
+            | (move >> 12 & 7) << 12)
+
+
+class Book:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.count = size // ENTRY.size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __len__(self):
+        return self.count
+
+    def _first(self, key):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) >> 1
+            if KEY.unpack_from(self.map, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entries(self, key):
+        # (polyglot move, weight) pairs for one position, found by bisection over the mapped file.
+        found = []
+        index = self._first(key) if self.count else 0
+        while index < self.count:
+            entry_key, move, weight, _ = ENTRY.unpack_from(self.map, index * ENTRY.size)
+            if entry_key != key:
+                break
+            found.append((move, weight))
+            index += 1
+        return found
+
+    def moves(self, board):
+        entries = self.entries(board.key)
+        if not entries:
+            return []
+        legal = {polyglot_move(move): move for move in board.legal_moves()}
+        return [(legal[move], weight) for move, weight in entries if move in legal and weight]
+
+    def probe(self, board, rng=None):
+        # With an rng the move is drawn in proportion to its weight; otherwise the heaviest wins.
+        moves = self.moves(board)
+        if not moves:
+            return None
+        if rng is None:
+            return max(moves, key=lambda item: item[1])[0]
+        return rng.choices([move for move, _ in moves], [weight for _, weight in moves])[0]
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_book(path=DEFAULT_BOOK_PATH):
+    if not os.path.exists(path):
+        return None
+    return Book(path)
+
+
+def build_book(source, path, max_ply=16, min_count=1):
+    # Weights follow the usual Polyglot convention: 2 per win and 1 per draw for the side that moved.
+    counts = {}
+    games = 0
+    for game in read_games(source):
+        scores = {"1-0": (2, 0), "0-1": (0, 2), "1/2-1/2": (1, 1)}.get(game.result, (1, 1))
+        try:
+            for ply, (board, move) in enumerate(replay(game, verify=False)):
+                if ply >= max_ply:
+                    break
+                entry = (board.key, polyglot_move(move))
+                played, weight = counts.get(entry, (0, 0))
+                counts[entry] = (played + 1, weight + scores[board.turn != "white"])
+        except ValueError:
+            continue
+        games += 1
+
+    entries = sorted((key, move, min(weight, MAX_WEIGHT)) for (key, move), (played, weight) in counts.items()
+                     if played >= min_count)
+    with open(path, "wb") as out:
+        for key, move, weight in entries:
+            out.write(ENTRY.pack(key, move, weight, 0))
+    return games, len(entries)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.book", description="Build or probe an opening book.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="compile a book from PGN games")
+    build.add_argument("pgn")
+    build.add_argument("book", nargs="?", default=DEFAULT_BOOK_PATH)
+    build.add_argument("--plies", type=int, default=16, help="only record the first N plies of each game")
+    build.add_argument("--min-count", type=int, default=1, help="drop moves played fewer times than this")
+    probe = commands.add_parser("probe", help="list the book moves for a position")
+    probe.add_argument("book", nargs="?", default=DEFAULT_BOOK_PATH)
+    probe.add_argument("--fen", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        games, entries = build_book(args.pgn, args.book, args.plies, args.min_count)
+        print(f"Games: {games}  Entries: {entries}  Size: {entries * ENTRY.size} bytes")
+        return 0
+
+    from chess.board import Board
+
+    board = Board.from_fen(args.fen) if args.fen else Board()
+    if not args.fen:
+        board.setup()
+    with Book(args.book) as book:
+        moves = sorted(book.moves(board), key=lambda item: -item[1])
+    for move, weight in moves:
+        print(f"{move_name(move)}  {weight}")
+    if not moves:
+        print("(no book moves)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import sys
+
+from chess.board import Board
+from chess.moves import move_name
+from chess.perft import perft, timed
+
+
+def parse_epd(line):
+    # "<placement> <side> <castling> <ep> [halfmove fullmove] [op operands;]..."
+    # Also accepts the perft-suite layout where operations start with ';' ("... ;D1 20 ;D2 400").
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f"invalid EPD: {line.strip()}")
+    rest = fields[4] if len(fields) > 4 else ""
+    clocks = ["0", "1"]
+    parts = rest.split(None, 2)
+    if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit():
+        clocks = parts[:2]
+        rest = parts[2] if len(parts) > 2 else ""
+
+    operations = {}
+    for operation in rest.split(";"):
+        opcode, _, operand = operation.strip().partition(" ")
+        if opcode:
+            operations[opcode] = operand.strip().strip('"')
+    clocks = [operations.get("hmvc", clocks[0]), operations.get("fmvn", clocks[1])]
+    return " ".join(fields[:4] + clocks), operations
+
+
+def read_epd(source):
+    # Yields (line number, FEN, operations) one line at a time, so the file is never held in memory.
+    if isinstance(source, str):
+        with open(source) as lines:
+            yield from read_epd(lines)
+        return
+    for number, line in enumerate(source, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fen, operations = parse_epd(line)
+        yield number, fen, operations
+
+
+def perft_positions(records, max_depth=None, out=None):
+    # Checks every "D<n> <count>" operation up to max_depth and writes one line per position as it finishes.
+    out = out or sys.stdout
+    board = Board()
+    positions = failures = total_nodes = 0
+    total_time = 0.0
+    for number, fen, operations in records:
+        board.set_fen(fen)
+        listed = [int(opcode[1:]) for opcode in operations if opcode[:1] == "D" and opcode[1:].isdigit()]
+        ok = True
+        results = []
+        for depth in range(1, (max_depth or max(listed, default=0)) + 1):
+            nodes, elapsed = timed(perft, board, depth)
+            total_nodes += nodes
+            total_time += elapsed
+            expected = operations.get(f"D{depth}")
+            if expected is not None and nodes != int(expected):
+                ok = False
+                failures += 1
+                results.append(f"D{depth} {nodes} (expected {expected})")
+            else:
+                results.append(f"D{depth} {nodes}")
+        positions += 1
+        print(f"{number}: {'ok  ' if ok else 'FAIL'} {fen}  {'  '.join(results)}", file=out, flush=True)
+    return positions, failures, total_nodes, total_time
+
+
+def search_positions(records, time_limit=1.0, max_depth=None, hash_mb=16, out=None):
+    # One engine (and one fixed-size hash table) serves the whole file.
+    from chess.ai import Engine, MAX_PLY
+
+    out = out or sys.stdout
+    engine = Engine(hash_mb)
+    board = Board()
+    positions = total_nodes = 0
+    total_time = 0.0
+    for number, fen, operations in records:
+        board.set_fen(fen)
+        engine.tt.clear()
+        result = engine.search(board, time_limit, max_depth or MAX_PLY)
+        positions += 1
+        total_nodes += result.nodes
+        total_time += result.elapsed
+        expected = "".join(f"  {opcode} {operations[opcode]}" for opcode in ("bm", "am") if opcode in operations)
+        print(f"{number}: {move_name(result.move) if result.move else '(none)'}  score {result.score}  "
+              f"depth {result.depth}  nodes {result.nodes}{expected}  id {operations.get('id', '-')}",
+              file=out, flush=True)
+    return positions, total_nodes, total_time
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.epd", description="Run perft or searches over an EPD file.")
+    parser.add_argument("path", help="EPD file, one position per line")
+    parser.add_argument("--search", action="store_true", help="search each position instead of running perft")
+    parser.add_argument("--depth", type=int, default=None,
+                        help="perft: deepest D<n> to check (default: all listed); search: depth limit")
+    parser.add_argument("--time", type=float, default=1.0, help="seconds per position (with --search)")
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size in MB (with --search)")
+    parser.add_argument("--out", default=None, help="write results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        records = read_epd(args.path)
+        if args.search:
+            positions, nodes, elapsed = search_positions(records, args.time, args.depth, args.hash, out)
+            failures = 0
+        else:
+            positions, failures, nodes, elapsed = perft_positions(records, args.depth, out)
+    finally:
+        if args.out:
+            out.close()
+    nps = nodes / elapsed if elapsed > 0 else 0.0
+    print(f"Positions: {positions}  Failures: {failures}  Nodes: {nodes}  Time: {elapsed:.3f}s  NPS: {nps:,.0f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+from chess.bitboard import WHITE, BLACK, KNIGHT, BISHOP, ROOK, QUEEN, KING, COLOR_INDEX, iter_bits, popcount
+
+PIECE_VALUES = [100, 320, 330, 500, 900, 20000]
+
+# Piece-square tables from White's point of view, rank 8 first, so a white
+# piece on square sq reads index sq and a black one reads sq ^ 56.
+PAWN_TABLE = [
+     0,   0,   0,   0,   0,   0,   0,   0,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    10,  10,  20,  30,  30,  20,  10,  10,
+     5,   5,  10,  25,  25,  10,   5,   5,
+     0,   0,   0,  20,  20,   0,   0,   0,
+     5,  -5, -10,   0,   0, -10,  -5,   5,
+     5,  10,  10, -20, -20,  10,  10,   5,
+     0,   0,   0,   0,   0,   0,   0,   0,
+]
+KNIGHT_TABLE = [
+   -50, -40, -30, -30, -30, -30, -40, -50,
+   -40, -20,   0,   0,   0,   0, -20, -40,
+   -30,   0,  10,  15,  15,  10,   0, -30,
+   -30,   5,  15,  20,  20,  15,   5, -30,
+   -30,   0,  15,  20,  20,  15,   0, -30,
+   -30,   5,  10,  15,  15,  10,   5, -30,
+   -40, -20,   0,   5,   5,   0, -20, -40,
+   -50, -40, -30, -30, -30, -30, -40, -50,
+]
+BISHOP_TABLE = [
+   -20, -10, -10, -10, -10, -10, -10, -20,
+   -10,   0,   0,   0,   0,   0,   0, -10,
+   -10,   0,   5,  10,  10,   5,   0, -10,
+   -10,   5,   5,  10,  10,   5,   5, -10,
+   -10,   0,  10,  10,  10,  10,   0, -10,
+   -10,  10,  10,  10,  10,  10,  10, -10,
+   -10,   5,   0,   0,   0,   0,   5, -10,
+   -20, -10, -10, -10, -10, -10, -10, -20,
+]
+ROOK_TABLE = [
+     0,   0,   0,   0,   0,   0,   0,   0,
+     5,  10,  10,  10,  10,  10,  10,   5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+     0,   0,   0,   5,   5,   0,   0,   0,
+]
+QUEEN_TABLE = [
+   -20, -10, -10,  -5,  -5, -10, -10, -20,
+   -10,   0,   0,   0,   0,   0,   0, -10,
+   -10,   0,   5,   5,   5,   5,   0, -10,
+    -5,   0,   5,   5,   5,   5,   0,  -5,
+     0,   0,   5,   5,   5,   5,   0,  -5,
+   -10,   5,   5,   5,   5,   5,   0, -10,
+   -10,   0,   5,   0,   0,   0,   0, -10,
+   -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+KING_MIDDLEGAME_TABLE = [
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -20, -30, -30, -40, -40, -30, -30, -20,
+   -10, -20, -20, -20, -20, -20, -20, -10,
+    20,  20,   0,   0,   0,   0,  20,  20,
+    20,  30,  10,   0,   0,  10,  30,  20,
+]
+KING_ENDGAME_TABLE = [
+   -50, -40, -30, -20, -20, -30, -40, -50,
+   -30, -20, -10,   0,   0, -10, -20, -30,
+   -30, -10,  20,  30,  30,  20, -10, -30,
+   -30, -10,  30,  40,  40,  30, -10, -30,
+   -30, -10,  30,  40,  40,  30, -10, -30,
+   -30, -10,  20,  30,  30,  20, -10, -30,
+   -30, -30,   0,   0,   0,   0, -30, -30,
+   -50, -30, -30, -30, -30, -30, -30, -50,
+]
+
+PHASE_WEIGHTS = [0, 1, 1, 2, 4, 0]
+MAX_PHASE = 24
+
+
+def _square_tables():
+    tables = []
+    for side in (WHITE, BLACK):
+        flip = 0 if side == WHITE else 56
+        sign = 1 if side == WHITE else -1
+        for kind, table in enumerate([PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE]):
+            tables.append([sign * (PIECE_VALUES[kind] + table[sq ^ flip]) for sq in range(64)])
+        tables.append(None)
+    return tables
+
+
+# Material plus placement for every piece code except the kings, signed for White.
+SQUARE_SCORES = _square_tables()
+KING_SCORES = [
+    [[sign * table[sq ^ flip] for sq in range(64)] for table in (KING_MIDDLEGAME_TABLE, KING_ENDGAME_TABLE)]
+    for sign, flip in ((1, 0), (-1, 56))
+]
+
+
+def game_phase(board):
+    bitboards = board.bitboards
+    phase = 0
+    for kind in (KNIGHT, BISHOP, ROOK, QUEEN):
+        phase += PHASE_WEIGHTS[kind] * (popcount(bitboards[kind]) + popcount(bitboards[kind + 6]))
+    return min(phase, MAX_PHASE)
+
+
+def evaluate(board):
+    bitboards = board.bitboards
+    score = 0
+    for code, table in enumerate(SQUARE_SCORES):
+        if table is not None:
+            for sq in iter_bits(bitboards[code]):
+                score += table[sq]
+
+    phase = game_phase(board)
+    for side, code in ((0, KING), (1, KING + 6)):
+        for sq in iter_bits(bitboards[code]):
+            middlegame, endgame = KING_SCORES[side][0][sq], KING_SCORES[side][1][sq]
+            score += (middlegame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+    return score if COLOR_INDEX[board.turn] == WHITE else -score
@@ -0,0 +1,189 @@
+import contextlib
+import importlib
+import sys
+import time
+from collections import Counter
+
+# Call counters and phase timers for the rules, the pieces and the search.
+#
+# Nothing is wrapped until enable() is called: it swaps counting/timing wrappers
+# into the classes and modules listed in PROBES and disable() puts the original
+# functions back, so a disabled build runs exactly the uninstrumented code.
+# timer() is for call sites such as the GUI loop and costs one global lookup
+# when disabled.
+
+# (module, owner attribute or None for a module-level function, function name, counter name, timed)
+PROBES = [
+    ("chess.rules", "Rules", "is_check", "is_check", False),
+    ("chess.rules", "Rules", "is_checkmate", "is_checkmate", True),
+    ("chess.rules", "Rules", "is_square_attacked", "is_square_attacked", False),
+    ("chess.board", "Board", "find_king", "find_king", False),
+    ("chess.pieces", "Pawn", "valid_moves", "valid_moves", False),
+    ("chess.pieces", "Knight", "valid_moves", "valid_moves", False),
+    ("chess.pieces", "Bishop", "valid_moves", "valid_moves", False),
+    ("chess.pieces", "Rook", "valid_moves", "valid_moves", False),
+    ("chess.pieces", "Queen", "valid_moves", "valid_moves", False),
+    ("chess.pieces", "King", "valid_moves", "valid_moves", False),
+    ("chess.board", None, "generate_legal_moves", "movegen", True),
+    ("chess.ai", None, "evaluate", "evaluate", True),
+    ("chess.ordering", "MoveOrderer", "order", "ordering", True),
+    ("chess.ordering", "MoveOrderer", "order_captures", "ordering", True),
+]
+
+counts = Counter()
+times = Counter()
+enabled = False
+_saved = []
+_search = {"nodes": 0, "time": 0.0, "last_nps": 0.0}
+
+
+def _counting(function, name):
+    def wrapper(*args, **kwargs):
+        counts[name] += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def _timing(function, name):
+    def wrapper(*args, **kwargs):
+        counts[name] += 1
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            times[name] += time.perf_counter() - start
+    return wrapper
+
+
+def _searching(function):
+    # Engine.search: besides its time, collect nodes, TT hits and the resulting NPS.
+    def wrapper(engine, *args, **kwargs):
+        hits = engine.tt.hits
+        start = time.perf_counter()
+        result = function(engine, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        counts["search"] += 1
+        counts["nodes"] += result.nodes
+        counts["tt_hits"] += engine.tt.hits - hits
+        times["search"] += elapsed
+        _search["nodes"] += result.nodes
+        _search["time"] += elapsed
+        if result.nodes:
+            _search["last_nps"] = result.nps
+        return result
+    return wrapper
+
+
+def _patch(owner, attribute, wrapper):
+    raw = owner.__dict__[attribute]
+    _saved.append((owner, attribute, raw))
+    if isinstance(raw, staticmethod):
+        setattr(owner, attribute, staticmethod(wrapper(raw.__func__)))
+    else:
+        setattr(owner, attribute, wrapper(raw))
+
+
+def enable():
+    global enabled
+    if enabled:
+        return
+    for module_name, owner_name, attribute, name, timed in PROBES:
+        module = importlib.import_module(module_name)
+        owner = getattr(module, owner_name) if owner_name else module
+        _patch(owner, attribute, lambda function: (_timing if timed else _counting)(function, name))
+    from chess.ai import Engine
+    _patch(Engine, "search", _searching)
+    enabled = True
+
+
+def disable():
+    global enabled
+    while _saved:
+        owner, attribute, raw = _saved.pop()
+        setattr(owner, attribute, raw)
+    enabled = False
+
+
+def reset():
+    counts.clear()
+    times.clear()
+    _search.update(nodes=0, time=0.0, last_nps=0.0)
+
+
+def record(name, elapsed):
+    counts[name] += 1
+    times[name] += elapsed
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def timer(name):
+    return _Timer(name) if enabled else _NULL_TIMER
+
+
+def snapshot():
+    # Copies of the counters plus milliseconds per timed phase and engine speed.
+    return {
+        "counts": dict(counts),
+        "ms": {name: value * 1000 for name, value in times.items()},
+        "nps": _search["nodes"] / _search["time"] if _search["time"] else 0.0,
+        "last_nps": _search["last_nps"],
+    }
+
+
+@contextlib.contextmanager
+def profiling():
+    # with profiling() as stats: ... -> stats holds the snapshot taken on exit.
+    was_enabled = enabled
+    reset()
+    enable()
+    stats = {}
+    try:
+        yield stats
+    finally:
+        stats.update(snapshot())
+        if not was_enabled:
+            disable()
+
+
+def main(argv=None):
+    import argparse
+    from chess.ai import Engine
+    from chess.board import Board
+
+    parser = argparse.ArgumentParser(prog="python -m chess.instrument",
+                                     description="Search a position with the instrumentation on and report each phase.")
+    parser.add_argument("--fen", default=None)
+    parser.add_argument("--time", type=float, default=2.0)
+    parser.add_argument("--depth", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    board = Board.from_fen(args.fen) if args.fen else Board()
+    if not args.fen:
+        board.setup()
+    with profiling() as stats:
+        Engine().search(board, args.time, args.depth)
+    for name, ms in sorted(stats["ms"].items(), key=lambda item: -item[1]):
+        print(f"{name:<14} {stats['counts'][name]:>10,} calls  {ms:>10.1f} ms")
+    print(f"nodes {stats['counts'].get('nodes', 0):,}  tt hits {stats['counts'].get('tt_hits', 0):,}  "
+          f"nps {stats['nps']:,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
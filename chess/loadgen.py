@@ -0,0 +1,147 @@
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import namedtuple
+
+from chess.server import DEFAULT_HOST, DEFAULT_PORT, GameServer, percentile
+
+LoadStats = namedtuple("LoadStats", "games moves engine_moves errors elapsed move_latencies engine_latencies")
+
+
+class Connection:
+    # One TCP connection shared by many games; replies are matched to requests by id.
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.next_id = 0
+        self.receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def open(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            reply = json.loads(line)
+            future = self.pending.pop(reply.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(reply)
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("server closed the connection"))
+
+    async def request(self, op, **fields):
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        self.writer.write(json.dumps(dict(fields, op=op, id=self.next_id)).encode() + b"\n")
+        return await future
+
+    async def close(self):
+        self.receiver.cancel()
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play_game(connection, rng, plies, think, engine_time, engine_depth, stats):
+    # Random moves for one side after a random pause averaging think seconds; with
+    # engine_time set the server's engine answers each of them.
+    reply = await connection.request("new")
+    game = reply["game"]
+    for _ in range(plies):
+        if not reply["legal"] or reply.get("status"):
+            break
+        if think:
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+        start = time.perf_counter()
+        reply = await connection.request("move", game=game, move=rng.choice(reply["legal"]))
+        stats["move"].append(time.perf_counter() - start)
+        if "error" in reply:
+            stats["errors"] += 1
+            break
+        if engine_time is not None and reply["legal"] and not reply.get("status"):
+            start = time.perf_counter()
+            reply = await connection.request("engine", game=game, time=engine_time, depth=engine_depth)
+            stats["engine"].append(time.perf_counter() - start)
+            if "error" in reply:
+                stats["errors"] += 1
+                break
+    await connection.request("close", game=game)
+
+
+async def run_load(host, port, games=1000, plies=40, connections=50, think=0.0, engine_time=None, engine_depth=2,
+                   seed=0):
+    # Every game runs concurrently, spread round-robin over the connections. With think=0
+    # the games fire as fast as replies come back, so latency measures a saturated server.
+    rng = random.Random(seed)
+    pool = [await Connection.open(host, port) for _ in range(connections)]
+    stats = {"move": [], "engine": [], "errors": 0}
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play_game(pool[number % connections], random.Random(rng.random()), plies,
+                                         think, engine_time, engine_depth, stats) for number in range(games)))
+    finally:
+        for connection in pool:
+            await connection.close()
+    return LoadStats(games, len(stats["move"]), len(stats["engine"]), stats["errors"],
+                     time.perf_counter() - start, stats["move"], stats["engine"])
+
+
+async def run_local(workers, **options):
+    # Server and client in one event loop: handy for a quick check, but both share one core.
+    server = GameServer(workers)
+    port = await server.start(DEFAULT_HOST, 0)
+    try:
+        return await run_load(DEFAULT_HOST, port, **options)
+    finally:
+        await server.stop()
+
+
+def report(stats, out=None):
+    out = out or sys.stdout
+    print(f"Games: {stats.games}  Moves: {stats.moves}  Engine moves: {stats.engine_moves}  "
+          f"Errors: {stats.errors}  Time: {stats.elapsed:.2f}s  "
+          f"Moves/s: {(stats.moves + stats.engine_moves) / stats.elapsed if stats.elapsed else 0.0:,.0f}", file=out)
+    for name, samples in (("move", stats.move_latencies), ("engine", stats.engine_latencies)):
+        if samples:
+            print(f"{name:>6} latency  p50 {percentile(samples, 0.50) * 1000:.2f}ms  "
+                  f"p99 {percentile(samples, 0.99) * 1000:.2f}ms  max {max(samples) * 1000:.2f}ms", file=out)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.loadgen", description="Drive many games against a server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--local", action="store_true", help="start a server inside this process instead")
+    parser.add_argument("--workers", type=int, default=None, help="engine processes for --local")
+    parser.add_argument("--games", type=int, default=1000, help="simultaneous games")
+    parser.add_argument("--plies", type=int, default=40, help="client moves per game")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--think", type=float, default=1.0, help="mean seconds between a game's moves (0 = flat out)")
+    parser.add_argument("--engine-time", type=float, default=None, help="ask the engine to reply to every move")
+    parser.add_argument("--engine-depth", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = dict(games=args.games, plies=args.plies, connections=min(args.connections, args.games),
+                   think=args.think, engine_time=args.engine_time, engine_depth=args.engine_depth, seed=args.seed)
+    if args.local:
+        stats = asyncio.run(run_local(args.workers, **options))
+    else:
+        stats = asyncio.run(run_load(args.host, args.port, **options))
+    report(stats)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+from chess.bitboard import WHITE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, FULL, lsb, iter_bits
+from chess.attacks import (KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, LINE,
+                           rook_attacks, bishop_attacks, attackers_to, is_attacked)
+from chess.moves import PROMOTION, EN_PASSANT, CASTLING
+
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+
+# Rights that survive a move touching each square.
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[60] = 15 & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[63] = 15 & ~WHITE_KINGSIDE
+CASTLING_MASK[56] = 15 & ~WHITE_QUEENSIDE
+CASTLING_MASK[4] = 15 & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASK[7] = 15 & ~BLACK_KINGSIDE
+CASTLING_MASK[0] = 15 & ~BLACK_QUEENSIDE
+
+# King and rook squares each right depends on.
+CASTLING_SQUARES = {right: sum(1 << sq for sq in range(64) if not CASTLING_MASK[sq] & right)
+                    for right in (WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE)}
+
+# right, king start, king end, squares that must be empty, squares the king crosses
+CASTLES = [
+    [(WHITE_KINGSIDE, 60, 62, 0x60 << 56, (61, 62)),
+     (WHITE_QUEENSIDE, 60, 58, 0x0e << 56, (59, 58))],
+    [(BLACK_KINGSIDE, 4, 6, 0x60, (5, 6)),
+     (BLACK_QUEENSIDE, 4, 2, 0x0e, (3, 2))],
+]
+
+PROMOTION_RANKS = [0xff, 0xff << 56]
+
+
+def _pinned(board, king_sq, side, own, enemy):
+    bitboards = board.bitboards
+    offset = 6 * (side ^ 1)
+    queens = bitboards[QUEEN + offset]
+    snipers = ((rook_attacks(king_sq, enemy) & (bitboards[ROOK + offset] | queens))
+               | (bishop_attacks(king_sq, enemy) & (bitboards[BISHOP + offset] | queens)))
+    pins = {}
+    occupied = own | enemy
+    for sniper in iter_bits(snipers):
+        blockers = BETWEEN[king_sq][sniper] & occupied
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pins[lsb(blockers)] = LINE[king_sq][sniper]
+    return pins
+
+
+def _add_pawn_moves(moves, start, targets, promotions):
+    for end in iter_bits(targets):
+        if promotions >> end & 1:
+            for kind in (QUEEN, ROOK, BISHOP, KNIGHT):
+                moves.append(start | end << 6 | kind << 12 | PROMOTION << 15)
+        else:
+            moves.append(start | end << 6)
+
+
+def generate_legal_moves(board, side):
+    bitboards = board.bitboards
+    them = side ^ 1
+    own = board.occupancy[side]
+    enemy = board.occupancy[them]
+    occupied = own | enemy
+    moves = []
+
+    king_sq = lsb(bitboards[KING + 6 * side])
+    without_king = occupied & ~(1 << king_sq)
+    for end in iter_bits(KING_ATTACKS[king_sq] & ~own):
+        if not is_attacked(board, end, them, without_king):
+            moves.append(king_sq | end << 6)
+
+    checkers = attackers_to(board, king_sq, them)
+    if checkers & (checkers - 1):
+        return moves
+    if checkers:
+        check_mask = checkers | BETWEEN[king_sq][lsb(checkers)]
+    else:
+        check_mask = FULL
+
+    pins = _pinned(board, king_sq, side, own, enemy)
+    targets_mask = ~own & check_mask
+    offset = 6 * side
+
+    for kind, attacks in ((KNIGHT, None), (BISHOP, bishop_attacks), (ROOK, rook_attacks), (QUEEN, None)):
+        for start in iter_bits(bitboards[kind + offset]):
+            if kind == KNIGHT:
+                if start in pins:
+                    continue
+                targets = KNIGHT_ATTACKS[start] & targets_mask
+            elif kind == QUEEN:
+                targets = (rook_attacks(start, occupied) | bishop_attacks(start, occupied)) & targets_mask
+            else:
+                targets = attacks(start, occupied) & targets_mask
+            if start in pins:
+                targets &= pins[start]
+            for end in iter_bits(targets):
+                moves.append(start | end << 6)
+
+    promotions = PROMOTION_RANKS[side]
+    forward = -8 if side == WHITE else 8
+    double_rank = 0xff << 40 if side == WHITE else 0xff << 16
+    empty = ~occupied
+    for start in iter_bits(bitboards[PAWN + offset]):
+        pin = pins.get(start, FULL)
+        single = 1 << (start + forward) & empty
+        targets = single
+        if single & double_rank:
+            targets |= 1 << (start + 2 * forward) & empty
+        targets |= PAWN_ATTACKS[side][start] & enemy
+        _add_pawn_moves(moves, start, targets & check_mask & pin, promotions)
+
+    ep = board.en_passant
+    if ep is not None:
+        captured = ep - forward
+        for start in iter_bits(PAWN_ATTACKS[them][ep] & bitboards[PAWN + offset]):
+            if not (check_mask >> ep & 1 or checkers >> captured & 1):
+                continue
+            after = occupied ^ (1 << start) ^ (1 << captured) | (1 << ep)
+            offset_them = 6 * them
+            queens = bitboards[QUEEN + offset_them]
+            if rook_attacks(king_sq, after) & (bitboards[ROOK + offset_them] | queens):
+                continue
+            if bishop_attacks(king_sq, after) & (bitboards[BISHOP + offset_them] | queens):
+                continue
+            moves.append(start | ep << 6 | EN_PASSANT << 15)
+
+    if not checkers and board.castling:
+        for right, start, end, path, crossed in CASTLES[side]:
+            if board.castling & right and not occupied & path:
+                if not any(is_attacked(board, sq, them) for sq in crossed):
+                    moves.append(start | end << 6 | CASTLING << 15)
+
+    return moves
@@ -0,0 +1,27 @@
+from chess.bitboard import square, row_col
+
+NORMAL, PROMOTION, EN_PASSANT, CASTLING = range(4)
+
+PROMOTION_LETTERS = {1: "n", 2: "b", 3: "r", 4: "q"}
+
+
+def encode_move(start, end, promotion=0, flag=NORMAL):
+    # Fields are read back inline where needed: move & 63, move >> 6 & 63, move >> 12 & 7, move >> 15.
+    return start | end << 6 | promotion << 12 | flag << 15
+
+
+def move_from_positions(start, end, promotion=0):
+    return encode_move(square(*start), square(*end), promotion, PROMOTION if promotion else NORMAL)
+
+
+def square_name(sq):
+    row, col = row_col(sq)
+    return "abcdefgh"[col] + str(8 - row)
+
+
+def move_name(move):
+    name = square_name(move & 63) + square_name(move >> 6 & 63)
+    promotion = move >> 12 & 7
+    if promotion:
+        name += PROMOTION_LETTERS[promotion]
+    return name
@@ -0,0 +1,164 @@
+from chess.bitboard import PAWN, BISHOP, ROOK, QUEEN, KING
+from chess.attacks import attackers_to, rook_attacks, bishop_attacks
+from chess.evaluation import PIECE_VALUES
+from chess.moves import EN_PASSANT
+
+MAX_PLY = 128
+HISTORY_LIMIT = 1 << 20
+
+TT_MOVE_SCORE = 1 << 30
+GOOD_CAPTURE_SCORE = 1 << 28
+KILLER_SCORES = (1 << 27, (1 << 27) - 1)
+BAD_CAPTURE_SCORE = -(1 << 28)
+
+# SEE values keep the king finite so that "king takes last" still counts.
+SEE_VALUES = PIECE_VALUES[:KING] + [10000]
+
+
+def mvv_lva(victim, attacker):
+    return PIECE_VALUES[victim] * 8 - attacker
+
+
+def see(board, move):
+    start, end = move & 63, move >> 6 & 63
+    squares = board.board
+    bitboards = board.bitboards
+    mover = squares[start >> 3][start & 7]
+    occupied = board.occupied ^ (1 << start)
+
+    if move >> 15 == EN_PASSANT:
+        captured_sq = end + 8 if mover.side == 0 else end - 8
+        occupied ^= 1 << captured_sq
+        gain = [SEE_VALUES[PAWN]]
+    else:
+        victim = squares[end >> 3][end & 7]
+        gain = [SEE_VALUES[victim.kind] if victim else 0]
+
+    diagonal = bitboards[BISHOP] | bitboards[BISHOP + 6] | bitboards[QUEEN] | bitboards[QUEEN + 6]
+    straight = bitboards[ROOK] | bitboards[ROOK + 6] | bitboards[QUEEN] | bitboards[QUEEN + 6]
+    attackers = (attackers_to(board, end, 0, occupied) | attackers_to(board, end, 1, occupied))
+    side = mover.side ^ 1
+    attacker_kind = mover.kind
+
+    while True:
+        gain.append(SEE_VALUES[attacker_kind] - gain[-1])
+        if max(-gain[-2], gain[-1]) < 0:
+            break
+        own = attackers & board.occupancy[side]
+        if not own:
+            break
+        offset = 6 * side
+        for kind in range(6):
+            candidates = own & bitboards[kind + offset]
+            if candidates:
+                break
+        occupied ^= candidates & -candidates
+        attackers |= (bishop_attacks(end, occupied) & diagonal) | (rook_attacks(end, occupied) & straight)
+        attackers &= occupied
+        attacker_kind = kind
+        side ^= 1
+
+    gain.pop()
+    while len(gain) > 1:
+        last = gain.pop()
+        gain[-1] = -max(-gain[-1], last)
+    return gain[0]
+
+
+class MoveOrderer:
+    def __init__(self, killers=True, history=True, use_see=True):
+        self.use_killers = killers
+        self.use_history = history
+        self.use_see = use_see
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = [[0] * 64 for _ in range(12)]
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.see_pruned = 0
+
+    def new_search(self):
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        for row in self.history:
+            for sq in range(64):
+                row[sq] >>= 1
+        self.reset_stats()
+
+    def score(self, board, move, tt_move, ply):
+        if move == tt_move:
+            return TT_MOVE_SCORE
+        squares = board.board
+        start, end = move & 63, move >> 6 & 63
+        piece = squares[start >> 3][start & 7]
+        victim = squares[end >> 3][end & 7]
+        if victim is not None or move >> 15 == EN_PASSANT:
+            value = mvv_lva(victim.kind if victim else PAWN, piece.kind)
+            if self.use_see and PIECE_VALUES[piece.kind] > PIECE_VALUES[victim.kind if victim else PAWN]:
+                if see(board, move) < 0:
+                    return BAD_CAPTURE_SCORE + value
+            return GOOD_CAPTURE_SCORE + value
+        promotion = move >> 12 & 7
+        if promotion:
+            return GOOD_CAPTURE_SCORE + PIECE_VALUES[promotion] - PIECE_VALUES[QUEEN]
+        if self.use_killers and ply < MAX_PLY:
+            killers = self.killers[ply]
+            if move == killers[0]:
+                return KILLER_SCORES[0]
+            if move == killers[1]:
+                return KILLER_SCORES[1]
+        if self.use_history:
+            return self.history[piece.code][end]
+        return 0
+
+    def order(self, board, moves, tt_move=0, ply=0):
+        scores = {move: self.score(board, move, tt_move, ply) for move in moves}
+        moves.sort(key=scores.__getitem__, reverse=True)
+        return moves
+
+    def order_captures(self, board, moves):
+        # Quiescence only looks at captures that don't lose material.
+        squares = board.board
+        scored = []
+        for move in moves:
+            start, end = move & 63, move >> 6 & 63
+            piece = squares[start >> 3][start & 7]
+            victim = squares[end >> 3][end & 7]
+            victim_kind = victim.kind if victim else PAWN
+            if self.use_see and PIECE_VALUES[piece.kind] > PIECE_VALUES[victim_kind] and see(board, move) < 0:
+                self.see_pruned += 1
+                continue
+            scored.append((mvv_lva(victim_kind, piece.kind) + (move >> 12 & 7) * 1000, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def record_cutoff(self, board, move, depth, ply, index):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        end = move >> 6 & 63
+        if board.occupied >> end & 1 or move >> 15 == EN_PASSANT or move >> 12 & 7:
+            return
+        if self.use_killers and ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        if self.use_history:
+            start = move & 63
+            piece = board.board[start >> 3][start & 7]
+            row = self.history[piece.code]
+            row[end] += depth * depth
+            if row[end] > HISTORY_LIMIT:
+                for table in self.history:
+                    for sq in range(64):
+                        table[sq] >>= 1
+
+    def stats(self):
+        return {
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+            "see_pruned": self.see_pruned,
+        }
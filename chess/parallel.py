@@ -0,0 +1,127 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from chess.ai import Engine, MAX_PLY
+from chess.moves import move_name
+from chess.perft import perft
+from chess.tt import TranspositionTable
+
+FLAG_BYTES = 8
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _perft_job(board, depth):
+    return perft(board, depth)
+
+
+def _root_jobs(board):
+    jobs = []
+    for move in board.legal_moves():
+        board.make_move(move)
+        jobs.append((move, board.copy()))
+        board.unmake_move()
+    return jobs
+
+
+def parallel_divide(board, depth, workers=None):
+    jobs = _root_jobs(board)
+    if depth <= 1:
+        return [(move_name(move), 1) for move, _ in jobs]
+    with ProcessPoolExecutor(workers or default_workers()) as pool:
+        futures = [(move, pool.submit(_perft_job, child, depth - 1)) for move, child in jobs]
+        return [(move_name(move), future.result()) for move, future in futures]
+
+
+def parallel_perft(board, depth, workers=None):
+    if depth <= 1:
+        return perft(board, depth)
+    return sum(nodes for _, nodes in parallel_divide(board, depth, workers))
+
+
+class SharedFlag:
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def set(self):
+        self.buffer[0] = 1
+
+    def clear(self):
+        self.buffer[0] = 0
+
+    def is_set(self):
+        return self.buffer[0] != 0
+
+
+def _helper_search(shm_name, hash_mb, board, time_limit, max_depth, helper_id):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    tt_bytes = TranspositionTable.bytes_for(hash_mb)
+    tt = TranspositionTable(hash_mb, buffer=shm.buf[:tt_bytes])
+    flag_view = shm.buf[tt_bytes:tt_bytes + FLAG_BYTES]
+    try:
+        engine = Engine(tt=tt, stop_event=SharedFlag(flag_view))
+        # Odd helpers run one ply ahead so the shared table fills with deeper results.
+        engine.depth_offset = helper_id & 1
+        result = engine.search(board, time_limit, max_depth)
+        return result.nodes
+    finally:
+        tt.release()
+        flag_view.release()
+        shm.close()
+
+
+class ParallelSearch:
+    # Lazy SMP: every process searches the root position and they cooperate
+    # only through a transposition table kept in shared memory.
+
+    def __init__(self, workers=None, hash_mb=64, book=None, tablebases=None):
+        self.workers = max(1, workers or default_workers())
+        self.hash_mb = hash_mb
+        tt_bytes = TranspositionTable.bytes_for(hash_mb)
+        self.shm = shared_memory.SharedMemory(create=True, size=tt_bytes + FLAG_BYTES)
+        self.tt = TranspositionTable(hash_mb, buffer=self.shm.buf[:tt_bytes])
+        self.flag_view = self.shm.buf[tt_bytes:tt_bytes + FLAG_BYTES]
+        self.stop_flag = SharedFlag(self.flag_view)
+        self.engine = Engine(tt=self.tt, stop_event=self.stop_flag, book=book, tablebases=tablebases)
+        self.pool = ProcessPoolExecutor(self.workers - 1) if self.workers > 1 else None
+
+    def search(self, board, time_limit=1.0, max_depth=MAX_PLY, callback=None):
+        start = time.perf_counter()
+        known = self.engine.known_move(board)
+        if known is not None:
+            return known._replace(elapsed=time.perf_counter() - start)
+        self.stop_flag.clear()
+        helpers = []
+        if self.pool is not None:
+            root = board.copy()
+            root.history = list(board.history)
+            helpers = [self.pool.submit(_helper_search, self.shm.name, self.hash_mb, root,
+                                        time_limit, max_depth, helper_id)
+                       for helper_id in range(1, self.workers)]
+
+        result = self.engine.search(board, time_limit, max_depth, callback)
+        self.stop_flag.set()
+        nodes = result.nodes + sum(helper.result() for helper in helpers)
+        elapsed = time.perf_counter() - start
+        return result._replace(nodes=nodes, elapsed=elapsed, nps=nodes / elapsed if elapsed else 0.0)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.shm is not None:
+            self.tt.release()
+            self.flag_view.release()
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
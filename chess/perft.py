@@ -0,0 +1,114 @@
+import functools
+import sys
+import time
+
+from chess.board import Board
+from chess.moves import move_name
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Published node counts (chessprogramming.org "Perft Results").
+REFERENCE_POSITIONS = [
+    ("start", START_FEN,
+     [20, 400, 8902, 197281, 4865609, 119060324]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603, 193690690]),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624, 11030083]),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333, 15833292]),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487, 89941194]),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594, 164075551]),
+]
+
+
+def perft(board, depth):
+    moves = board.legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    results = []
+    for move in board.legal_moves():
+        board.make_move(move)
+        results.append((move_name(move), perft(board, depth - 1)))
+        board.unmake_move()
+    return results
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def report(nodes, elapsed, out):
+    nps = nodes / elapsed if elapsed > 0 else 0.0
+    print(f"Nodes: {nodes}  Time: {elapsed:.3f}s  NPS: {nps:,.0f}", file=out)
+
+
+def run_reference(max_nodes, out=None):
+    out = out or sys.stdout
+    failures = 0
+    total_nodes = 0
+    total_time = 0.0
+    for name, fen, counts in REFERENCE_POSITIONS:
+        board = Board.from_fen(fen)
+        for depth, expected in enumerate(counts, 1):
+            if expected > max_nodes:
+                break
+            nodes, elapsed = timed(perft, board, depth)
+            total_nodes += nodes
+            total_time += elapsed
+            status = "ok" if nodes == expected else "FAIL"
+            if nodes != expected:
+                failures += 1
+            print(f"{name:<10} depth {depth}  {nodes:>10}  expected {expected:>10}  {status}", file=out)
+    report(total_nodes, total_time, out)
+    return failures
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.perft", description="Count move-generation leaf nodes.")
+    parser.add_argument("depth", type=int, nargs="?", default=4)
+    parser.add_argument("--fen", default=START_FEN)
+    parser.add_argument("--divide", action="store_true", help="print the node count below each root move")
+    parser.add_argument("--workers", type=int, default=1, help="split root moves across this many processes")
+    parser.add_argument("--check", action="store_true", help="verify published counts for reference positions")
+    parser.add_argument("--max-nodes", type=int, default=1_000_000,
+                        help="skip reference depths above this many nodes (with --check)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 1 if run_reference(args.max_nodes) else 0
+
+    board = Board.from_fen(args.fen)
+    divide_function = divide
+    if args.workers > 1:
+        from chess.parallel import parallel_divide
+        divide_function = functools.partial(parallel_divide, workers=args.workers)
+    if args.divide or args.workers > 1:
+        results, elapsed = timed(divide_function, board, args.depth)
+        if args.divide:
+            for name, nodes in results:
+                print(f"{name}: {nodes}")
+        nodes = sum(count for _, count in results)
+    else:
+        nodes, elapsed = timed(perft, board, args.depth)
+    report(nodes, elapsed, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
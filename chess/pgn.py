@@ -0,0 +1,247 @@
+import re
+import sys
+import time
+from collections import namedtuple
+
+from chess.board import Board
+from chess.bitboard import COLOR_INDEX, WHITE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, lsb, piece_index
+from chess.attacks import PAWN_ATTACKS, is_attacked
+from chess.pieces import PIECES
+from chess.moves import PROMOTION, EN_PASSANT, CASTLING, encode_move, square_name
+
+Game = namedtuple("Game", "headers moves result")
+ReplayStats = namedtuple("ReplayStats", "games plies errors elapsed")
+
+PIECE_LETTERS = {"N": KNIGHT, "B": BISHOP, "R": ROOK, "Q": QUEEN, "K": KING}
+KIND_LETTERS = {kind: letter for letter, kind in PIECE_LETTERS.items()}
+RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+FILE_MASK = 0x0101010101010101
+
+SAN_PATTERN = re.compile(r"([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?$")
+TAG_PATTERN = re.compile(r'\[\s*(\w+)\s+"(.*)"\s*\]')
+TOKEN_PATTERN = re.compile(r"\s*([{}();]|[^\s{}();]+)")
+MOVE_NUMBER_PATTERN = re.compile(r"\d+\.+")
+
+
+def _legal_san_move(board, kind, end, promotion, file_mask, rank_mask, castling=False):
+    squares = board.board
+    candidates = []
+    for move in board.legal_moves():
+        start = move & 63
+        if move >> 6 & 63 != end or (move >> 15 == CASTLING) != castling or move >> 12 & 7 != promotion:
+            continue
+        if squares[start >> 3][start & 7].kind == kind and (file_mask & rank_mask) >> start & 1:
+            candidates.append(move)
+    if len(candidates) != 1:
+        return None
+    return candidates[0]
+
+
+def parse_san(board, san, verify=True):
+    # With verify=False the mover is found from attack tables alone, which is
+    # much faster for trusted input; full legal generation is only used to
+    # settle the rare case where a pin is what makes the move unambiguous.
+    side = COLOR_INDEX[board.turn]
+    token = san.rstrip("+#!?")
+    if token in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        start = 60 if side == WHITE else 4
+        end = start + 2 if len(token) == 3 else start - 2
+        move = encode_move(start, end, 0, CASTLING)
+        if verify and _legal_san_move(board, KING, end, 0, -1, -1, castling=True) is None:
+            raise ValueError(f"illegal move: {san}")
+        return move
+
+    match = SAN_PATTERN.match(token)
+    if match is None:
+        raise ValueError(f"invalid SAN: {san}")
+    letter, from_file, from_rank, capture, target, promotion = match.groups()
+    kind = PIECE_LETTERS[letter] if letter else PAWN
+    row, col = board._convert_position(target)
+    end = row * 8 + col
+    promotion = PIECE_LETTERS[promotion] if promotion else 0
+    file_mask = FILE_MASK << "abcdefgh".index(from_file) if from_file else -1
+    rank_mask = 0xff << 8 * (8 - int(from_rank)) if from_rank else -1
+
+    if verify:
+        move = _legal_san_move(board, kind, end, promotion, file_mask, rank_mask)
+        if move is None:
+            raise ValueError(f"illegal or ambiguous move: {san}")
+        return move
+
+    sources = board.bitboards[piece_index(kind, side)] & file_mask & rank_mask
+    if kind == PAWN:
+        if capture:
+            sources &= PAWN_ATTACKS[side ^ 1][end]
+        else:
+            behind = end + 8 if side == WHITE else end - 8
+            if not board.occupied >> behind & 1:
+                behind = behind + 8 if side == WHITE else behind - 8
+            sources &= 1 << behind
+    else:
+        sources &= PIECES[kind].attacks(end, board.occupied)
+    if not sources or sources & (sources - 1):
+        move = _legal_san_move(board, kind, end, promotion, file_mask, rank_mask)
+        if move is None:
+            raise ValueError(f"illegal or ambiguous move: {san}")
+        return move
+
+    start = lsb(sources)
+    if promotion:
+        return encode_move(start, end, promotion, PROMOTION)
+    if kind == PAWN and capture and end == board.en_passant and not board.occupied >> end & 1:
+        return encode_move(start, end, 0, EN_PASSANT)
+    return encode_move(start, end)
+
+
+def move_to_san(board, move):
+    start, end, flag = move & 63, move >> 6 & 63, move >> 15
+    piece = board.board[start >> 3][start & 7]
+    capture = board.occupied >> end & 1 or flag == EN_PASSANT
+    if flag == CASTLING:
+        san = "O-O" if end > start else "O-O-O"
+    elif piece.kind == PAWN:
+        san = (square_name(start)[0] + "x" if capture else "") + square_name(end)
+        if move >> 12 & 7:
+            san += "=" + KIND_LETTERS[move >> 12 & 7]
+    else:
+        rivals = [other & 63 for other in board.legal_moves()
+                  if other != move and other >> 6 & 63 == end and board.bitboards[piece.code] >> (other & 63) & 1]
+        prefix = ""
+        if rivals:
+            if all(rival & 7 != start & 7 for rival in rivals):
+                prefix = square_name(start)[0]
+            elif all(rival >> 3 != start >> 3 for rival in rivals):
+                prefix = square_name(start)[1]
+            else:
+                prefix = square_name(start)
+        san = KIND_LETTERS[piece.kind] + prefix + ("x" if capture else "") + square_name(end)
+
+    board.make_move(move)
+    side = COLOR_INDEX[board.turn]
+    if is_attacked(board, lsb(board.bitboards[piece_index(KING, side)]), side ^ 1):
+        san += "+" if board.legal_moves() else "#"
+    board.unmake_move()
+    return san
+
+
+def read_games(source):
+    # Yields one Game at a time; only the current game's tags and moves are kept in memory.
+    if isinstance(source, str):
+        with open(source, encoding="utf-8", errors="replace") as lines:
+            yield from read_games(lines)
+        return
+
+    headers, moves = {}, []
+    comment = False
+    variation = 0
+    for line in source:
+        if not comment and not variation and line.startswith("["):
+            match = TAG_PATTERN.match(line)
+            if match:
+                if moves:
+                    yield Game(headers, moves, "*")
+                    headers, moves = {}, []
+                headers[match.group(1)] = match.group(2)
+                continue
+        if line.startswith("%"):
+            continue
+
+        pos = 0
+        while True:
+            if comment:
+                close = line.find("}", pos)
+                if close < 0:
+                    break
+                comment = False
+                pos = close + 1
+            match = TOKEN_PATTERN.match(line, pos)
+            if match is None:
+                break
+            token = match.group(1)
+            pos = match.end()
+            if token == "{":
+                comment = True
+            elif token == ";":
+                break
+            elif token == "(":
+                variation += 1
+            elif token == ")":
+                variation = max(variation - 1, 0)
+            elif variation or token[0] == "$" or token == "}":
+                continue
+            elif token in RESULTS:
+                yield Game(headers, moves, token)
+                headers, moves = {}, []
+            else:
+                number = MOVE_NUMBER_PATTERN.match(token)
+                if number:
+                    token = token[number.end():]
+                if token:
+                    moves.append(token)
+    if moves or headers:
+        yield Game(headers, moves, "*")
+
+
+def start_board(headers):
+    fen = headers.get("FEN")
+    if fen:
+        return Board.from_fen(fen)
+    board = Board()
+    board.setup()
+    return board
+
+
+def replay(game, verify=True):
+    # Yields (board, move) before each move is played; the board is shared and advances as you iterate.
+    board = start_board(game.headers)
+    for san in game.moves:
+        move = parse_san(board, san, verify)
+        yield board, move
+        board.make_move(move)
+
+
+def play_game(game, verify=True):
+    board = start_board(game.headers)
+    for san in game.moves:
+        board.make_move(parse_san(board, san, verify))
+    return board
+
+
+def replay_games(source, verify=True, max_games=None, errors=None):
+    start = time.perf_counter()
+    games = plies = failed = 0
+    for game in read_games(source):
+        if max_games is not None and games + failed >= max_games:
+            break
+        try:
+            play_game(game, verify)
+        except ValueError as error:
+            failed += 1
+            if errors is not None:
+                print(f"game {games + failed}: {error}", file=errors)
+            continue
+        games += 1
+        plies += len(game.moves)
+    return ReplayStats(games, plies, failed, time.perf_counter() - start)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.pgn", description="Replay a PGN database through the rules.")
+    parser.add_argument("path", help="PGN file")
+    parser.add_argument("--trusted", action="store_true",
+                        help="bulk mode: resolve SAN from attack tables without re-checking legality")
+    parser.add_argument("--max-games", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    stats = replay_games(args.path, verify=not args.trusted, max_games=args.max_games, errors=sys.stderr)
+    rate = stats.games / stats.elapsed if stats.elapsed > 0 else 0.0
+    print(f"Games: {stats.games}  Plies: {stats.plies}  Errors: {stats.errors}  "
+          f"Time: {stats.elapsed:.3f}s  Games/s: {rate:,.1f}  "
+          f"Plies/s: {stats.plies / stats.elapsed if stats.elapsed > 0 else 0.0:,.0f}")
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
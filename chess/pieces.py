@@ -1,8 +1,33 @@
-import pygame
+from chess.bitboard import COLORS, COLOR_INDEX, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, piece_index, row_col, iter_bits
+from chess.attacks import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, rook_attacks, bishop_attacks, queen_attacks, is_attacked
 
 class Piece:
-    def __init__(self, color):
-        self.color = color
+    # Pieces are flyweights: Pawn("white") always returns the same immutable
+    # instance, and all per-piece state (such as whether it has moved) lives on the board.
+    __slots__ = ("color", "side", "code")
+    kind = None
+    symbol = None
+    _shared = {}
+
+    def __new__(cls, color):
+        piece = Piece._shared.get((cls, color))
+        if piece is None:
+            piece = object.__new__(cls)
+            side = COLOR_INDEX[color]
+            object.__setattr__(piece, "color", color)
+            object.__setattr__(piece, "side", side)
+            object.__setattr__(piece, "code", piece_index(cls.kind, side))
+            Piece._shared[(cls, color)] = piece
+        return piece
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} pieces are shared and immutable")
+
+    def __reduce__(self):
+        return type(self), (self.color,)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.color!r})"
 
     def valid_moves(self, pos, board):
         raise NotImplementedError
@@ -10,10 +35,21 @@ class Piece:
     def capture_moves(self, pos, board):
         raise NotImplementedError
 
+    def attacks(self, sq, occupied):
+        raise NotImplementedError
+
+    def _targets(self, pos, board):
+        row, col = pos
+        targets = self.attacks(row * 8 + col, board.occupied) & ~board.occupancy[self.side]
+        return [row_col(sq) for sq in iter_bits(targets)]
+
 class Pawn(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.has_moved = False
+    __slots__ = ()
+    kind = PAWN
+    symbol = "p"
+
+    def attacks(self, sq, occupied):
+        return PAWN_ATTACKS[self.side][sq]
 
     def valid_moves(self, pos, board):
         row, col = pos
@@ -23,105 +59,76 @@ class Pawn(Piece):
         if 0 <= row + direction < 8 and board.board[row + direction][col] is None:
             moves.append((row + direction, col))
 
-        if not self.has_moved and row == (6 if self.color == "white" else 1):
+        if row == (6 if self.color == "white" else 1):
             if board.board[row + direction][col] is None and board.board[row + 2 * direction][col] is None:
                 moves.append((row + 2 * direction, col))
 
-        for dc in [-1, 1]:
-            if 0 <= col + dc < 8 and 0 <= row + direction < 8:
-                target = board.board[row + direction][col + dc]
-                if target and target.color != self.color:
-                    moves.append((row + direction, col + dc))
-
+        captures = PAWN_ATTACKS[self.side][row * 8 + col] & board.occupancy[self.side ^ 1]
+        moves.extend(row_col(sq) for sq in iter_bits(captures))
         return moves
 
-    def move(self, start, end, board):
-        self.has_moved = True
-
 class Rook(Piece):
+    __slots__ = ()
+    kind = ROOK
+    symbol = "r"
+
+    def attacks(self, sq, occupied):
+        return rook_attacks(sq, occupied)
+
     def valid_moves(self, pos, board):
-        row, col = pos
-        moves = []
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            r, c = row, col
-            while 0 <= r + dr < 8 and 0 <= c + dc < 8:
-                r, c = r + dr, c + dc
-                if board.board[r][c] is None:
-                    moves.append((r, c))
-                elif board.board[r][c].color != self.color:
-                    moves.append((r, c))
-                    break
-                else:
-                    break
-        return moves
+        return self._targets(pos, board)
 
 class Knight(Piece):
-    def valid_moves(self, pos, board):
-        row, col = pos
-        moves = []
-        for dr, dc in [(-2, -1), (-2, 1), (2, -1), (2, 1), (-1, -2), (1, -2), (-1, 2), (1, 2)]:
-            r, c = row + dr, col + dc
-            if 0 <= r < 8 and 0 <= c < 8:
-                target = board.board[r][c]
-                if target is None or target.color != self.color:
-                    moves.append((r, c))
-        return moves
+    __slots__ = ()
+    kind = KNIGHT
+    symbol = "n"
 
-class Bishop(Piece):
-    def valid_moves(self, pos, board):
-        row, col = pos
-        moves = []
-        for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            r, c = row, col
-            while 0 <= r + dr < 8 and 0 <= c + dc < 8:
-                r, c = r + dr, c + dc
-                if board.board[r][c] is None:
-                    moves.append((r, c))
-                elif board.board[r][c].color != self.color:
-                    moves.append((r, c))
-                    break
-                else:
-                    break
-        return moves
+    def attacks(self, sq, occupied):
+        return KNIGHT_ATTACKS[sq]
 
-class Queen(Piece):
     def valid_moves(self, pos, board):
-        row, col = pos
-        moves = []
-        for piece in [Rook(self.color), Bishop(self.color)]:
-            moves.extend(piece.valid_moves(pos, board))
-        return moves
+        return self._targets(pos, board)
 
-class King(Piece):
-    def valid_moves(self, position, board):
-        row, col = position
-        moves = []
+class Bishop(Piece):
+    __slots__ = ()
+    kind = BISHOP
+    symbol = "b"
 
-        directions = [(-1, -1), (-1, 0), (-1, 1),
-                      (0, -1),         (0, 1),
-                      (1, -1), (1, 0), (1, 1)]
+    def attacks(self, sq, occupied):
+        return bishop_attacks(sq, occupied)
 
-        from chess.rules import Rules  
+    def valid_moves(self, pos, board):
+        return self._targets(pos, board)
 
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                piece = board.board[new_row][new_col]
+class Queen(Piece):
+    __slots__ = ()
+    kind = QUEEN
+    symbol = "q"
 
-                if piece is None or piece.color != self.color:
-                    original_piece = board.board[new_row][new_col]
-                    board.board[new_row][new_col] = self
-                    board.board[row][col] = None
+    def attacks(self, sq, occupied):
+        return queen_attacks(sq, occupied)
 
-                    if not getattr(board, "checking_king", False):  
-                        board.checking_king = True
-                        if not Rules.is_king_in_check(board, self.color):
-                            moves.append((new_row, new_col))
-                        board.checking_king = False
-                    else:
-                        moves.append((new_row, new_col))
+    def valid_moves(self, pos, board):
+        return self._targets(pos, board)
 
-                    board.board[row][col] = self
-                    board.board[new_row][new_col] = original_piece
+class King(Piece):
+    __slots__ = ()
+    kind = KING
+    symbol = "k"
 
-        return moves
+    def attacks(self, sq, occupied):
+        return KING_ATTACKS[sq]
+
+    def valid_moves(self, position, board):
+        row, col = position
+        sq = row * 8 + col
+        # Lift the king off the board so sliders keep attacking the squares behind it.
+        occupied = board.occupied & ~(1 << sq)
+        targets = KING_ATTACKS[sq] & ~board.occupancy[self.side]
+        return [row_col(target) for target in iter_bits(targets)
+                if not is_attacked(board, target, self.side ^ 1, occupied)]
+
+PIECE_TYPES = {PAWN: Pawn, KNIGHT: Knight, BISHOP: Bishop, ROOK: Rook, QUEEN: Queen, KING: King}
+PIECE_SYMBOLS = {cls.symbol: cls for cls in PIECE_TYPES.values()}
+# The shared instance for every piece code: PIECES[piece_index(kind, side)].
+PIECES = [PIECE_TYPES[kind](color) for color in COLORS for kind in range(6)]
@@ -1,167 +1,97 @@
-from chess.board import Board
-from chess.pieces import Rook, Bishop, Queen, King, Knight, Pawn
+from chess.bitboard import COLOR_INDEX, BISHOP, ROOK, QUEEN, KING, square, row_col, lsb, iter_bits
+from chess.utils import opponent
+from chess.tablebase import LOSS
 
 class Rules:
+    # Optional chess.tablebase.Tablebases consulted before generating moves.
+    tablebases = None
+
+    # Square queries read the board's incrementally maintained AttackMap.
+
+    @staticmethod
+    def is_square_attacked(board, square, by_color):
+        row, col = square
+        return bool(board.track_attacks().is_attacked(row * 8 + col, COLOR_INDEX[by_color]))
+
+    @staticmethod
+    def get_attackers(board, square, by_color):
+        row, col = square
+        return [row_col(sq) for sq in iter_bits(board.track_attacks().attackers(row * 8 + col, COLOR_INDEX[by_color]))]
 
     @staticmethod
     def is_check(board, king_position, color):
-        row, col = king_position
-        for r in range(8):
-            for c in range(8):
-                piece = board.board[r][c]
-                if piece and piece.color != color:
-                    if (row, col) in piece.valid_moves((r, c), board):
-                        return True
-        return False
+        return Rules.is_square_attacked(board, king_position, opponent(color))
 
     @staticmethod
     def is_checkmate(board, king_position, color):
         if not Rules.is_check(board, king_position, color):
             return False
-        
-        row, col = king_position
-        for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-            r, c = row + dr, col + dc
-            if 0 <= r < 8 and 0 <= c < 8:
-                piece = board.board[r][c]
-                if piece is None or piece.color != color:
-                    if not Rules.is_check(board, (r, c), color):
-                        return False
-
-        for r in range(8):
-            for c in range(8):
-                piece = board.board[r][c]
-                if piece and piece.color == color:
-                    valid_moves = piece.valid_moves((r, c), board.board)
-                    for move in valid_moves:
-                        temp_board = Board()
-                        temp_board.board = [row[:] for row in board.board]
-                        temp_board.board[move[0]][move[1]] = temp_board.board[r][c]
-                        temp_board.board[r][c] = None
-                        if not Rules.is_check(temp_board, king_position, color):
-                            return False
-
-        return True
+        if Rules.tablebases is not None and color == board.turn:
+            entry = Rules.tablebases.probe(board)
+            if entry is not None:
+                return entry == (LOSS, 0)
+        return not board.legal_moves(color)
 
     @staticmethod
-    def validate_move(board, move, color):
-        start_pos, end_pos = board.notation_to_index(move)
-        piece = board.get_piece(start_pos)
-
-        if not piece or piece.color != color:
-            return False
-
-        valid_moves = piece.valid_moves(board, start_pos)
-
-        if end_pos not in valid_moves:
+    def is_stalemate(board, color):
+        if Rules.is_king_in_check(board, color):
             return False
+        return not board.legal_moves(color)
 
-        return True
+    @staticmethod
+    def validate_move(board, move, color):
+        start, end = move.split()
+        start_pos, end_pos = board._convert_position(start), board._convert_position(end)
+        return Rules.is_valid_move(start_pos, end_pos, board, color)
 
     @staticmethod
     def is_king_in_check(board, color):
-        king_pos = board.find_king(color)
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.board[row][col]
-                if piece and piece.color != color:
-                    if king_pos in piece.valid_moves((row, col), board):
-                        return True
-        return False
+        return Rules.is_check(board, board.find_king(color), color)
 
     @staticmethod
     def filter_moves_that_leave_king_in_check(board, color, moves):
-        valid_moves = []
-        for move in moves:
-            original_piece = board.board[move[0]][move[1]]
-            board.board[move[0]][move[1]] = board.board[move[0]][move[1]]
-            board.board[move[0]][move[1]] = None
-            if not Rules.is_king_in_check(board, color):
-                valid_moves.append(move)
-            board.board[move[0]][move[1]] = original_piece
-        return valid_moves
-    
+        legal = {(move & 63, move >> 6 & 63) for move in board.legal_moves(color)}
+        return [(start, end) for start, end in moves if (square(*start), square(*end)) in legal]
+
     @staticmethod
     def is_valid_move(start, end, board, color):
-        start_row, start_col = start
-        end_row, end_col = end
-        piece = board.board[start_row][start_col]
-        
-        if piece is None:
+        piece = board.get_piece(start)
+        if piece is None or piece.color != color:
             return False
-
-        if Rules.is_king_in_check(board, color):
-            if not (Rules.is_checkmate(board, (start_row, start_col), color) or 
-                    piece.__class__.__name__.lower() == 'king' or 
-                    Rules.can_block_or_capture_check(start_row, start_col, piece, end_row, end_col, board)):
-                return False
-
-        valid_moves = piece.valid_moves((start_row, start_col), board.board)
-        if (end_row, end_col) in valid_moves:
-            target_piece = board.board[end_row][end_col]
-            if target_piece is None or target_piece.color != piece.color:
-                temp_board = Board()
-                temp_board.board = [row[:] for row in board.board]
-                temp_board.board[end_row][end_col] = temp_board.board[start_row][start_col]
-                temp_board.board[start_row][start_col] = None
-
-                king_position = None
-                for r in range(8):
-                    for c in range(8):
-                        temp_piece = temp_board.board[r][c]
-                        if temp_piece and temp_piece.__class__.__name__.lower() == 'king' and temp_piece.color == piece.color:
-                            king_position = (r, c)
-                            break
-
-                if not king_position:
-                    return False
-
-                if Rules.is_check(temp_board, king_position, piece.color):
-                    return False
-
-                return True
-        return False
+        start_sq, end_sq = square(*start), square(*end)
+        return any(move & 63 == start_sq and move >> 6 & 63 == end_sq for move in board.legal_moves(color))
 
     @staticmethod
     def can_block_or_capture_check(start_row, start_col, piece, end_row, end_col, board):
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                temp_piece = board.board[r][c]
-                if temp_piece and temp_piece.__class__.__name__.lower() == 'king' and temp_piece.color == piece.color:
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
+        king_pos = board.find_king(piece.color)
 
         check_row, check_col = Rules.get_checking_piece_position(board, king_pos, piece.color)
 
         if check_row is None and check_col is None:
             return False
 
-        if piece.__class__.__name__.lower() in ['rook', 'bishop', 'queen']:
+        if piece.kind in (ROOK, BISHOP, QUEEN):
             return Rules.can_block_check_with_line_piece(start_row, start_col, piece, check_row, check_col, board)
-        if piece.__class__.__name__.lower() == 'king':
+        if piece.kind == KING:
             return Rules.can_capture_checking_piece(start_row, start_col, piece, check_row, check_col, board)
         
         return False
 
     @staticmethod
     def can_block_check_with_line_piece(start_row, start_col, piece, check_row, check_col, board):
-        if isinstance(piece, (Rook, Queen)):
+        if piece.kind in (ROOK, QUEEN):
             if start_col == check_col:
                 return Rules.is_between_check_and_king(start_row, start_col, check_row, check_col, board)
             elif start_row == check_row:
                 return Rules.is_between_check_and_king(start_row, start_col, check_row, check_col, board)
-        elif isinstance(piece, Bishop):
+        elif piece.kind == BISHOP:
             if abs(start_row - check_row) == abs(start_col - check_col):
                 return Rules.is_between_check_and_king(start_row, start_col, check_row, check_col, board)
         return False
 
     @staticmethod
     def can_capture_checking_piece(start_row, start_col, piece, check_row, check_col, board):
-        if isinstance(piece, King):
+        if piece.kind == KING:
             if abs(start_row - check_row) <= 1 and abs(start_col - check_col) <= 1:
                 target_piece = board.board[check_row][check_col]
                 if target_piece and target_piece.color != piece.color:
@@ -201,25 +131,7 @@ class Rules:
 
     @staticmethod
     def get_checking_piece_position(board, king_pos, color):
-        check_row, check_col = None, None
-        for r in range(8):
-            for c in range(8):
-                piece = board.board[r][c]
-                if piece and piece.color != color:
-                    if isinstance(piece, (Rook, Bishop, Queen)):
-                        if Rules.is_attack_possible(piece, r, c, king_pos[0], king_pos[1], board):
-                            check_row, check_col = r, c
-                            break
-                    elif isinstance(piece, Knight):
-                        if Rules.is_knight_check(piece, r, c, king_pos[0], king_pos[1]):
-                            check_row, check_col = r, c
-                            break
-                    elif isinstance(piece, King):
-                        if abs(r - king_pos[0]) <= 1 and abs(c - king_pos[1]) <= 1:
-                            check_row, check_col = r, c
-                            break
-                    elif isinstance(piece, Pawn):
-                        if Rules.is_pawn_check(piece, r, c, king_pos[0], king_pos[1]):
-                            check_row, check_col = r, c
-                            break
-        return check_row, check_col
+        checkers = board.track_attacks().attackers(square(*king_pos), COLOR_INDEX[opponent(color)])
+        if not checkers:
+            return None, None
+        return row_col(lsb(checkers))
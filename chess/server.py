@@ -0,0 +1,235 @@
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from chess.board import Board
+from chess.ai import Engine
+from chess.moves import move_name
+from chess.status import GameTracker
+
+# Newline-delimited JSON over TCP. Every request is an object with an "op" and an
+# optional "id" that is echoed back, so one connection can carry many games at once:
+#   {"op": "new", "fen": ...}                      -> {"game", "fen", "legal"}
+#   {"op": "move", "game": 1, "move": "e2e4"}      -> {"fen", "legal", "status", "result"}
+#   {"op": "engine", "game": 1, "time": 0.1, "depth": 64} -> {"move", "fen", "legal", "status", "result"}
+# "status" names how the game ended (chess.status reasons) and is null while it goes on.
+#   {"op": "state" | "close", "game": 1}, {"op": "stats"}
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+LATENCY_SAMPLES = 100000
+MAX_ENGINE_TIME = 10.0
+MAX_ENGINE_DEPTH = 64
+
+_engine = None
+
+
+def _init_engine(hash_mb):
+    global _engine
+    _engine = Engine(hash_mb)
+
+
+def _engine_move(board, time_limit, max_depth):
+    # Runs in a pool process; each process keeps one engine and its hash table.
+    if _engine is None:
+        _init_engine(16)
+    return _engine.search(board, time_limit, max_depth).move
+
+
+def engine_limits(request):
+    # Every server search is bounded: a zero time would mean no deadline at all.
+    time_limit = request.get("time", 0.1)
+    max_depth = request.get("depth", MAX_ENGINE_DEPTH)
+    numeric = all(type(value) in (int, float) for value in (time_limit, max_depth))
+    if not numeric or not time_limit > 0 or not max_depth >= 1:
+        raise ValueError("time and depth must be positive numbers")
+    return min(time_limit, MAX_ENGINE_TIME), int(min(max_depth, MAX_ENGINE_DEPTH))
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Game:
+    __slots__ = ("board", "lock", "legal", "tracker", "status")
+
+    def __init__(self, board):
+        self.board = board
+        self.lock = asyncio.Lock()
+        self.tracker = GameTracker(board)
+        self._update()
+
+    def _update(self):
+        moves = self.board.legal_moves()
+        self.status = self.tracker.status(moves)
+        # A finished game (repetition, fifty moves, bare kings) takes no further moves.
+        self.legal = {} if self.status else {move_name(move): move for move in moves}
+
+    def state(self):
+        return {"fen": self.board.fen(), "legal": list(self.legal),
+                "status": self.status.reason if self.status else None,
+                "result": self.status.result if self.status else "*"}
+
+    def play(self, move):
+        self.board.make_move(move)
+        self._update()
+
+
+class GameServer:
+    def __init__(self, workers=None, hash_mb=16, max_games=100000):
+        self.games = {}
+        self.next_game = 1
+        self.max_games = max_games
+        self.pool = ProcessPoolExecutor(workers, initializer=_init_engine, initargs=(hash_mb,))
+        self.latencies = {"move": deque(maxlen=LATENCY_SAMPLES), "engine": deque(maxlen=LATENCY_SAMPLES)}
+        self.requests = 0
+        self.server = None
+        self.clients = {}
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.serve_client, host, port, limit=1 << 20)
+        return self.server.sockets[0].getsockname()[1]
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def stop(self):
+        # Closing each client transport ends its reader loop, so the handlers finish normally.
+        if self.server is not None:
+            self.server.close()
+        for writer in list(self.clients.values()):
+            writer.close()
+        await asyncio.gather(*self.clients, return_exceptions=True)
+        self.close()
+
+    async def serve_client(self, reader, writer):
+        # Requests run as separate tasks, so an engine move never holds up other games on the connection.
+        handler = asyncio.current_task()
+        self.clients[handler] = writer
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self.respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            del self.clients[handler]
+
+    async def respond(self, line, writer):
+        start = time.perf_counter()
+        request = {}
+        try:
+            request = json.loads(line)
+            reply = await self.handle(request)
+        except KeyError as error:
+            reply = {"error": f"missing field: {error}"}
+        except Exception as error:
+            # Bad input and engine failures alike are reported to the client rather than dropping the request.
+            reply = {"error": str(error) or type(error).__name__}
+        if not isinstance(request, dict):
+            request = {}
+        if "id" in request:
+            reply["id"] = request["id"]
+        if not writer.is_closing():
+            writer.write(json.dumps(reply).encode() + b"\n")
+        self.requests += 1
+        latencies = self.latencies.get(request.get("op"))
+        if latencies is not None:
+            latencies.append(time.perf_counter() - start)
+
+    def game(self, request):
+        game = self.games.get(request["game"])
+        if game is None:
+            raise ValueError(f"no such game: {request['game']}")
+        return game
+
+    async def handle(self, request):
+        op = request["op"]
+        if op == "new":
+            if len(self.games) >= self.max_games:
+                raise ValueError("server full")
+            board = Board.from_fen(request["fen"]) if request.get("fen") else Board()
+            if not request.get("fen"):
+                board.setup()
+            number = self.next_game
+            self.next_game += 1
+            game = self.games[number] = Game(board)
+            return dict(game.state(), game=number)
+        if op == "move":
+            game = self.game(request)
+            async with game.lock:
+                move = game.legal.get(request["move"])
+                if move is None:
+                    raise ValueError(f"illegal move: {request['move']}")
+                game.play(move)
+                return game.state()
+        if op == "engine":
+            game = self.game(request)
+            async with game.lock:
+                if not game.legal:
+                    raise ValueError("game is over")
+                time_limit, max_depth = engine_limits(request)
+                move = await asyncio.get_running_loop().run_in_executor(
+                    self.pool, _engine_move, game.board.copy(history=True), time_limit, max_depth)
+                game.play(move)
+                return dict(game.state(), move=move_name(move))
+        if op == "state":
+            return self.game(request).state()
+        if op == "close":
+            return {"closed": self.games.pop(request["game"], None) is not None}
+        if op == "stats":
+            return self.stats()
+        raise ValueError(f"unknown op: {op}")
+
+    def stats(self):
+        stats = {"games": len(self.games), "requests": self.requests}
+        for op, latencies in self.latencies.items():
+            samples = list(latencies)
+            stats[f"{op}_p50_ms"] = percentile(samples, 0.50) * 1000
+            stats[f"{op}_p99_ms"] = percentile(samples, 0.99) * 1000
+        return stats
+
+
+async def serve(host, port, workers, hash_mb):
+    server = GameServer(workers, hash_mb)
+    port = await server.start(host, port)
+    print(f"Serving on {host}:{port}", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.server", description="Multi-game JSON-over-TCP server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="engine processes")
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size per engine process in MB")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.hash))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import statistics
+import subprocess
+import sys
+
+# Each probe runs in a fresh interpreter so that nothing is already imported.
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {modules}
+from chess.board import Board
+board = Board()
+board.setup()
+board.legal_moves()
+elapsed = time.perf_counter() - start
+print(elapsed, int("pygame" in sys.modules))
+"""
+
+DEFAULT_MODULES = "chess.board, chess.rules, chess.ai"
+
+
+def measure(modules=DEFAULT_MODULES, runs=10):
+    timings = []
+    gui_loaded = False
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(modules=modules)],
+                                capture_output=True, text=True, check=True).stdout.splitlines()[-1].split()
+        timings.append(float(output[0]))
+        gui_loaded = gui_loaded or output[1] == "1"
+    return timings, gui_loaded
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.startup",
+                                     description="Time a cold import of the headless engine core.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--modules", default=DEFAULT_MODULES)
+    args = parser.parse_args(argv)
+
+    timings, gui_loaded = measure(args.modules, args.runs)
+    print(f"import + first move generation over {args.runs} runs: "
+          f"median {statistics.median(timings) * 1000:.1f} ms  "
+          f"min {min(timings) * 1000:.1f} ms  max {max(timings) * 1000:.1f} ms")
+    print(f"pygame imported: {'yes' if gui_loaded else 'no'}")
+    return 1 if gui_loaded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+from chess.ai import in_check
+from chess.bitboard import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, popcount
+
+Status = namedtuple("Status", "result reason")
+
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+REPETITION = "threefold repetition"
+FIFTY_MOVES = "fifty-move rule"
+INSUFFICIENT = "insufficient material"
+
+DARK_SQUARES = 0x55AA55AA55AA55AA
+MAJORS_AND_PAWNS = (PAWN, ROOK, QUEEN, PAWN + 6, ROOK + 6, QUEEN + 6)
+
+
+def insufficient_material(board):
+    # Bare kings, a single minor piece, or bishops that all stand on one square colour.
+    bitboards = board.bitboards
+    if any(bitboards[code] for code in MAJORS_AND_PAWNS):
+        return False
+    knights = bitboards[KNIGHT] | bitboards[KNIGHT + 6]
+    bishops = bitboards[BISHOP] | bitboards[BISHOP + 6]
+    if popcount(knights | bishops) <= 1:
+        return True
+    return not knights and (not bishops & DARK_SQUARES or not bishops & ~DARK_SQUARES)
+
+
+class GameTracker:
+    # Decides whether the game on `board` has ended. The undo records seen so far
+    # are mirrored with a count per position key and synchronised with
+    # board.history on each query: moves made or unmade since the last call cost
+    # O(1) each, so threefold repetition never rescans the game.
+
+    def __init__(self, board):
+        self.board = board
+        self.records = []
+        self.counts = {}
+
+    def sync(self):
+        history = self.board.history
+        records = self.records
+        counts = self.counts
+        while len(records) > len(history) or records and records[-1] is not history[len(records) - 1]:
+            counts[records.pop()[7]] -= 1
+        for record in history[len(records):]:
+            records.append(record)
+            counts[record[7]] = counts.get(record[7], 0) + 1
+
+    def repetitions(self):
+        # How many times the current position has occurred, this time included.
+        self.sync()
+        return self.counts.get(self.board.key, 0) + 1
+
+    def status(self, legal=None):
+        # Status(result, reason) once the game is over, otherwise None. Pass the
+        # side to move's legal moves if they are already at hand.
+        board = self.board
+        if legal is None:
+            legal = board.legal_moves()
+        if not legal:
+            if in_check(board):
+                return Status("0-1" if board.turn == "white" else "1-0", CHECKMATE)
+            return Status("1/2-1/2", STALEMATE)
+        if board.halfmove_clock >= 100:
+            return Status("1/2-1/2", FIFTY_MOVES)
+        if self.repetitions() >= 3:
+            return Status("1/2-1/2", REPETITION)
+        if insufficient_material(board):
+            return Status("1/2-1/2", INSUFFICIENT)
+        return None
@@ -0,0 +1,580 @@
+import mmap
+import os
+import random
+import sys
+import time
+from array import array
+
+from chess.bitboard import (COLOR_INDEX, COLORS, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+                            popcount, iter_bits)
+from chess.attacks import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, rook_attacks, bishop_attacks, queen_attacks
+
+# One byte per index: 0 = draw, 255 = illegal, otherwise plies to mate + 1.
+# An odd number of plies means the side to move mates; an even one means it is mated.
+DRAW, UNKNOWN, INVALID = 0, 254, 255
+MAX_PLIES = UNKNOWN - 2
+WIN, LOSS = 1, -1
+
+LETTERS = "PNBRQK"
+MAX_PIECES = 4
+DEFAULT_DIRECTORY = "tablebases"
+DEFAULT_TABLES = ["KQvK", "KRvK", "KPvK"]
+
+
+def _transform(function):
+    return [function(sq >> 3, sq & 7) for sq in range(64)]
+
+
+# The eight board symmetries; pawns only allow the first two (identity and a left-right mirror).
+TRANSFORMS = [
+    _transform(lambda row, col: row * 8 + col),
+    _transform(lambda row, col: row * 8 + 7 - col),
+    _transform(lambda row, col: (7 - row) * 8 + col),
+    _transform(lambda row, col: (7 - row) * 8 + 7 - col),
+    _transform(lambda row, col: col * 8 + row),
+    _transform(lambda row, col: col * 8 + 7 - row),
+    _transform(lambda row, col: (7 - col) * 8 + row),
+    _transform(lambda row, col: (7 - col) * 8 + 7 - row),
+]
+# White king squares kept after symmetry reduction: the a1-d1-d4 triangle, or files a-d with pawns.
+TRIANGLE = [sq for sq in range(64) if (sq & 7) <= 3 and 7 - (sq >> 3) <= (sq & 7)]
+HALF_BOARD = [sq for sq in range(64) if (sq & 7) <= 3]
+
+
+def attacks(kind, side, sq, occupied):
+    if kind == PAWN:
+        return PAWN_ATTACKS[side][sq]
+    if kind == KNIGHT:
+        return KNIGHT_ATTACKS[sq]
+    if kind == BISHOP:
+        return bishop_attacks(sq, occupied)
+    if kind == KING:
+        return KING_ATTACKS[sq]
+    if kind == ROOK:
+        return rook_attacks(sq, occupied)
+    return queen_attacks(sq, occupied)
+
+
+def material_name(pieces):
+    white = sorted((kind for kind, side in pieces if side == WHITE and kind != KING), reverse=True)
+    black = sorted((kind for kind, side in pieces if side == BLACK and kind != KING), reverse=True)
+    return "K" + "".join(LETTERS[kind] for kind in white) + "vK" + "".join(LETTERS[kind] for kind in black)
+
+
+def orient(pieces, squares, side):
+    # Tables are stored with the stronger side as white; mirror ranks and swap colours otherwise.
+    white = sorted((kind for kind, colour in pieces if colour == WHITE and kind != KING), reverse=True)
+    black = sorted((kind for kind, colour in pieces if colour == BLACK and kind != KING), reverse=True)
+    if (len(black), black) > (len(white), white):
+        pieces = [(kind, colour ^ 1) for kind, colour in pieces]
+        squares = [sq ^ 56 for sq in squares]
+        side ^= 1
+    return pieces, squares, side
+
+
+def insufficient(pieces):
+    others = [kind for kind, _ in pieces if kind != KING]
+    return not others or others in ([KNIGHT], [BISHOP])
+
+
+class Layout:
+    # Maps (piece squares, side to move) to a table index and back.
+
+    def __init__(self, name):
+        white, black = name.split("v")
+        self.name = name
+        self.pieces = ([(KING, WHITE), (KING, BLACK)] + [(LETTERS.index(char), WHITE) for char in white[1:]]
+                       + [(LETTERS.index(char), BLACK) for char in black[1:]])
+        self.pawns = any(kind == PAWN for kind, _ in self.pieces)
+        self.transforms = TRANSFORMS[:2] if self.pawns else TRANSFORMS
+        self.king_squares = HALF_BOARD if self.pawns else TRIANGLE
+        self.king_index = {sq: index for index, sq in enumerate(self.king_squares)}
+        # For each white king square, the symmetries that bring it into king_squares.
+        self.king_transforms = [[transform for transform in self.transforms if transform[sq] in self.king_index]
+                                for sq in range(64)]
+        self.size = len(self.king_squares) * 64 ** (len(self.pieces) - 1) * 2
+        # Runs of identical pieces, whose squares are stored in sorted order.
+        self.groups = []
+        start = 2
+        for end in range(3, len(self.pieces) + 1):
+            if end == len(self.pieces) or self.pieces[end] != self.pieces[start]:
+                if end - start > 1:
+                    self.groups.append((start, end))
+                start = end
+
+    def index(self, squares, side):
+        # With the white king on the a1-h8 diagonal two symmetries keep it in the
+        # triangle; the smaller resulting index is the canonical one.
+        transforms = self.king_transforms[squares[0]]
+        if len(transforms) == 1 and not self.groups:
+            transform = transforms[0]
+            index = self.king_index[transform[squares[0]]]
+            for sq in squares[1:]:
+                index = index << 6 | transform[sq]
+            return index << 1 | side
+        best = None
+        for transform in transforms:
+            mapped = [transform[sq] for sq in squares]
+            for start, end in self.groups:
+                mapped[start:end] = sorted(mapped[start:end])
+            index = self.king_index[mapped[0]]
+            for sq in mapped[1:]:
+                index = index << 6 | sq
+            if best is None or index < best:
+                best = index
+        return best << 1 | side
+
+    def decode(self, index):
+        side = index & 1
+        index >>= 1
+        squares = []
+        for _ in range(len(self.pieces) - 1):
+            squares.append(index & 63)
+            index >>= 6
+        squares.append(self.king_squares[index])
+        squares.reverse()
+        return squares, side
+
+    def arrange(self, pieces, squares):
+        # Reorders squares given in any piece order into this layout's order.
+        by_piece = {}
+        for piece, sq in zip(pieces, squares):
+            by_piece.setdefault(piece, []).append(sq)
+        return [by_piece[piece].pop() for piece in self.pieces]
+
+    def attacked(self, squares, target, by_side, occupied):
+        for (kind, side), sq in zip(self.pieces, squares):
+            if side == by_side and sq is not None and attacks(kind, side, sq, occupied) >> target & 1:
+                return True
+        return False
+
+    def legal(self, squares, side):
+        occupied = 0
+        for (kind, _), sq in zip(self.pieces, squares):
+            if occupied >> sq & 1 or kind == PAWN and sq >> 3 in (0, 7):
+                return False
+            occupied |= 1 << sq
+        return not self.attacked(squares, squares[1 - side], side, occupied)
+
+    def moves(self, squares, side):
+        # Legal moves as (moving piece index, squares after the move, captured piece index or None,
+        # promotion kind or 0).
+        occupied = own = 0
+        owner = {}
+        for index, ((_, colour), sq) in enumerate(zip(self.pieces, squares)):
+            occupied |= 1 << sq
+            owner[sq] = index
+            if colour == side:
+                own |= 1 << sq
+        king = side
+        for index, (kind, colour) in enumerate(self.pieces):
+            if colour != side:
+                continue
+            sq = squares[index]
+            if kind == PAWN:
+                forward = sq - 8 if side == WHITE else sq + 8
+                targets = PAWN_ATTACKS[side][sq] & occupied & ~own
+                if not occupied >> forward & 1:
+                    targets |= 1 << forward
+                    double = forward - 8 if side == WHITE else forward + 8
+                    if sq >> 3 == (6 if side == WHITE else 1) and not occupied >> double & 1:
+                        targets |= 1 << double
+            else:
+                targets = attacks(kind, side, sq, occupied) & ~own
+            for target in iter_bits(targets):
+                captured = owner.get(target)
+                after = list(squares)
+                after[index] = target
+                if captured is not None:
+                    after[captured] = None
+                if self.attacked(after, after[king], side ^ 1, occupied & ~(1 << sq) | 1 << target):
+                    continue
+                if kind == PAWN and target >> 3 in (0, 7):
+                    for promotion in (QUEEN, ROOK, BISHOP, KNIGHT):
+                        yield index, after, captured, promotion
+                else:
+                    yield index, after, captured, 0
+
+    def predecessors(self, squares, side):
+        # Positions (as indices) from which the side that just moved could have reached this one
+        # without a capture or promotion.
+        occupied = 0
+        for sq in squares:
+            occupied |= 1 << sq
+        mover = side ^ 1
+        found = set()
+        for index, (kind, colour) in enumerate(self.pieces):
+            if colour != mover:
+                continue
+            sq = squares[index]
+            if kind == PAWN:
+                back = sq + 8 if mover == WHITE else sq - 8
+                origins = 0
+                if not occupied >> back & 1 and back >> 3 not in (0, 7):
+                    origins = 1 << back
+                    double = back + 8 if mover == WHITE else back - 8
+                    if sq >> 3 == (4 if mover == WHITE else 3) and not occupied >> double & 1:
+                        origins |= 1 << double
+            else:
+                origins = attacks(kind, mover, sq, occupied) & ~occupied
+            for origin in iter_bits(origins):
+                before = list(squares)
+                before[index] = origin
+                found.add(self.index(before, mover))
+        return found
+
+
+def decode_value(value):
+    if value == INVALID:
+        return None
+    if value == DRAW:
+        return DRAW, 0
+    plies = value - 1
+    return (WIN if plies & 1 else LOSS), plies
+
+
+class Tablebases:
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        self.tables = {}
+        self.max_pieces = MAX_PIECES
+
+    def path(self, name):
+        return os.path.join(self.directory, name + ".bin")
+
+    def add(self, name, data):
+        self.tables[name] = (Layout(name), data)
+
+    def table(self, name):
+        if name not in self.tables:
+            path = self.path(name)
+            if os.path.exists(path):
+                with open(path, "rb") as source:
+                    self.tables[name] = (Layout(name), mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                self.tables[name] = None
+        return self.tables[name]
+
+    def available(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith(".bin"))
+
+    def probe_pieces(self, pieces, squares, side):
+        # (WIN/DRAW/LOSS for the side to move, plies to mate) or None if no table covers it.
+        if insufficient(pieces):
+            return DRAW, 0
+        pieces, squares, side = orient(pieces, squares, side)
+        entry = self.table(material_name(pieces))
+        if entry is None:
+            return None
+        layout, data = entry
+        return decode_value(data[layout.index(layout.arrange(pieces, squares), side)])
+
+    def probe(self, board):
+        if popcount(board.occupied) > self.max_pieces or board.castling or board.en_passant is not None:
+            return None
+        pieces, squares = [], []
+        for code, bb in enumerate(board.bitboards):
+            for sq in iter_bits(bb):
+                pieces.append((code % 6, code // 6))
+                squares.append(sq)
+        return self.probe_pieces(pieces, squares, COLOR_INDEX[board.turn])
+
+    def best_move(self, board):
+        # The move that keeps the table result and the fastest mate (or slowest loss), with its plies.
+        root = self.probe(board)
+        if root is None:
+            return None
+        best = None
+        for move in board.legal_moves():
+            board.make_move(move)
+            child = self.probe(board)
+            board.unmake_move()
+            if child is None:
+                return None
+            wdl, plies = child
+            rank = (-wdl, -plies if wdl == LOSS else plies)
+            if best is None or rank > best[0]:
+                best = (rank, move)
+        if best is None:
+            return None
+        return best[1], root
+
+    def close(self):
+        for entry in self.tables.values():
+            if entry is not None and isinstance(entry[1], mmap.mmap):
+                entry[1].close()
+        self.tables = {}
+
+
+def dependencies(name):
+    # Tables reached by a capture or promotion, which must exist before this one is generated.
+    layout = Layout(name)
+    found = set()
+    for index, (kind, side) in enumerate(layout.pieces):
+        if kind == KING:
+            continue
+        rest = layout.pieces[:index] + layout.pieces[index + 1:]
+        if not insufficient(rest):
+            found.add(material_name(orient(rest, [0] * len(rest), WHITE)[0]))
+        if kind == PAWN:
+            for promotion in (KNIGHT, BISHOP, ROOK, QUEEN):
+                promoted = layout.pieces[:index] + [(promotion, side)] + layout.pieces[index + 1:]
+                if not insufficient(promoted):
+                    found.add(material_name(orient(promoted, [0] * len(promoted), WHITE)[0]))
+    return sorted(found)
+
+
+def _scan(name, tablebases, start, stop):
+    # First pass over indices start..stop: marks illegal positions, mates and stalemates,
+    # counts each position's distinct non-losing continuations and resolves captures and
+    # promotions through the smaller tables. Returns the slices plus (plies, index) seeds.
+    layout = Layout(name)
+    count = stop - start
+    result = bytearray([INVALID]) * count
+    remaining = array("B", bytes(count))
+    longest = array("B", bytes(count))
+    seeds = []
+    for index in range(start, stop):
+        squares, side = layout.decode(index)
+        if layout.index(squares, side) != index or not layout.legal(squares, side):
+            continue
+        offset = index - start
+        result[offset] = UNKNOWN
+        children = set()
+        escapes = 0
+        moved = False
+        best_win = None
+        for mover, after, captured, promotion in layout.moves(squares, side):
+            moved = True
+            if captured is None and not promotion:
+                children.add(layout.index(after, side ^ 1))
+                continue
+            pieces = [(promotion, colour) if promotion and position == mover else (kind, colour)
+                      for position, (kind, colour) in enumerate(layout.pieces) if position != captured]
+            child = tablebases.probe_pieces(
+                pieces, [sq for position, sq in enumerate(after) if position != captured], side ^ 1)
+            if child is None:
+                raise ValueError(f"{name} needs the tables {', '.join(dependencies(name))}")
+            wdl, plies = child
+            if wdl == LOSS:
+                best_win = plies + 1 if best_win is None else min(best_win, plies + 1)
+                escapes += 1
+            elif wdl == WIN:
+                longest[offset] = max(longest[offset], plies + 1)
+            else:
+                escapes += 1
+        if not moved:
+            if layout.attacked(squares, squares[side], side ^ 1, sum(1 << sq for sq in squares)):
+                seeds.append((0, index))
+            else:
+                result[offset] = DRAW
+            continue
+        remaining[offset] = len(children) + escapes
+        if best_win is not None:
+            seeds.append((best_win, index))
+        elif not remaining[offset]:
+            seeds.append((longest[offset], index))
+    return bytes(result), remaining.tobytes(), longest.tobytes(), seeds
+
+
+def _scan_job(name, directory, start, stop):
+    tablebases = Tablebases(directory)
+    try:
+        return _scan(name, tablebases, start, stop)
+    finally:
+        tablebases.close()
+
+
+def generate(name, tablebases, pool=None, chunks=64):
+    # Retrograde analysis: after the scan, positions are finalised in order of mate
+    # distance and each one updates only its predecessors. With a process pool the
+    # scan is split across workers, which load the smaller tables from disk.
+    layout = Layout(name)
+    size = layout.size
+    if pool is None:
+        parts = [_scan(name, tablebases, 0, size)]
+    else:
+        step = -(-size // chunks) + 1 & ~1
+        futures = [pool.submit(_scan_job, name, tablebases.directory, start, min(start + step, size))
+                   for start in range(0, size, step)]
+        parts = [future.result() for future in futures]
+    result = bytearray(b"".join(part[0] for part in parts))
+    remaining = array("B", b"".join(part[1] for part in parts))
+    longest = array("B", b"".join(part[2] for part in parts))
+    levels = [[] for _ in range(MAX_PLIES + 2)]
+    for part in parts:
+        for plies, index in part[3]:
+            levels[plies].append(index)
+    parts = None
+
+    for plies, level in enumerate(levels):
+        for index in level:
+            if result[index] != UNKNOWN:
+                continue
+            if plies > MAX_PLIES:
+                raise ValueError(f"{name}: mate distance exceeds {MAX_PLIES} plies")
+            result[index] = plies + 1
+            squares, side = layout.decode(index)
+            for parent in layout.predecessors(squares, side):
+                if result[parent] != UNKNOWN:
+                    continue
+                if not plies & 1:
+                    levels[plies + 1].append(parent)
+                    continue
+                remaining[parent] -= 1
+                if plies + 1 > longest[parent]:
+                    longest[parent] = plies + 1
+                if not remaining[parent]:
+                    levels[longest[parent]].append(parent)
+        level.clear()
+
+    return bytes(result.replace(bytes([UNKNOWN]), bytes([DRAW])))
+
+
+def build_order(names, tablebases, force=False):
+    # Requested tables preceded by every missing table they depend on.
+    order = []
+
+    def visit(name):
+        if name in order or not force and name not in names and tablebases.table(name) is not None:
+            return
+        for dependency in dependencies(name):
+            visit(dependency)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def generate_all(names, directory=DEFAULT_DIRECTORY, workers=None, force=False, out=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    out = out or sys.stdout
+    os.makedirs(directory, exist_ok=True)
+    tablebases = Tablebases(directory)
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for name in build_order(names, tablebases, force):
+            start = time.perf_counter()
+            data = generate(name, tablebases, pool)
+            path = tablebases.path(name)
+            with open(path + ".tmp", "wb") as target:
+                target.write(data)
+            os.replace(path + ".tmp", path)
+            tablebases.tables.pop(name, None)
+            print(f"{name}: {len(data)} entries  max {max(data.replace(bytes([INVALID]), b'')) - 1} plies  "
+                  f"{time.perf_counter() - start:.1f}s", file=out, flush=True)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        tablebases.close()
+
+
+def board_from(pieces, squares, side):
+    from chess.board import Board
+    from chess.pieces import PIECES
+    from chess.zobrist import compute_key
+
+    board = Board()
+    for (kind, colour), sq in zip(pieces, squares):
+        board._put(sq, PIECES[kind + 6 * colour])
+    board.turn = COLORS[side]
+    board.key = compute_key(board)
+    return board
+
+
+def verify(tablebases, name, samples=20, max_plies=5, seed=0):
+    # Compares random table entries with a plain search: decided positions within
+    # max_plies must get the same mate distance, draws must not look like mates.
+    from chess.ai import Engine, MATE, MATE_BOUND
+
+    layout, data = tablebases.table(name)
+    rng = random.Random(seed)
+    mismatches = []
+    checked = 0
+    attempts = 0
+    while checked < samples and attempts < samples * 1000:
+        attempts += 1
+        index = rng.randrange(layout.size)
+        entry = decode_value(data[index])
+        if entry is None or entry[1] > max_plies:
+            continue
+        squares, side = layout.decode(index)
+        board = board_from(layout.pieces, squares, side)
+        wdl, plies = entry
+        # The engine returns a forced move without searching, so step through those first.
+        moves = board.legal_moves()
+        while len(moves) == 1 and wdl:
+            board.make_move(moves[0])
+            moves = board.legal_moves()
+            wdl, plies = -wdl, plies - 1
+        result = Engine(hash_mb=1).search(board, time_limit=0, max_depth=max(plies, 1) if wdl else max_plies)
+        if wdl == WIN:
+            expected_ok = result.score == MATE - plies
+        elif wdl == LOSS:
+            expected_ok = result.score == -(MATE - plies)
+        else:
+            expected_ok = abs(result.score) < MATE_BOUND
+        checked += 1
+        if not expected_ok:
+            mismatches.append((board.fen(), entry, result.score))
+    return checked, mismatches
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.tablebase", description="Endgame tablebases.")
+    parser.add_argument("--dir", default=DEFAULT_DIRECTORY, help="directory holding the .bin tables")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("generate", help="build tables (and any they depend on)")
+    build.add_argument("names", nargs="*", default=DEFAULT_TABLES, help="materials such as KQvK or KRvKN")
+    build.add_argument("--workers", type=int, default=None, help="processes for the first pass")
+    build.add_argument("--force", action="store_true", help="rebuild tables that already exist")
+    check = commands.add_parser("verify", help="compare table entries with search")
+    check.add_argument("names", nargs="*", default=None)
+    check.add_argument("--samples", type=int, default=20)
+    check.add_argument("--max-plies", type=int, default=5)
+    probe = commands.add_parser("probe", help="look up a position")
+    probe.add_argument("fen")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        for name in args.names:
+            if len(Layout(name).pieces) > MAX_PIECES:
+                parser.error(f"{name}: at most {MAX_PIECES} pieces are supported")
+        generate_all(args.names, args.dir, args.workers, args.force)
+        return 0
+
+    tablebases = Tablebases(args.dir)
+    if args.command == "verify":
+        failures = 0
+        for name in args.names or tablebases.available():
+            checked, mismatches = verify(tablebases, name, args.samples, args.max_plies)
+            failures += len(mismatches)
+            print(f"{name}: {checked} positions checked, {len(mismatches)} mismatches")
+            for fen, entry, score in mismatches:
+                print(f"  {fen}  table {entry}  search {score}")
+        return 1 if failures else 0
+
+    from chess.board import Board
+    from chess.moves import move_name
+
+    board = Board.from_fen(args.fen)
+    entry = tablebases.probe(board)
+    if entry is None:
+        print("not in the tablebases")
+        return 1
+    wdl, plies = entry
+    best = tablebases.best_move(board)
+    print(f"{ {WIN: 'win', DRAW: 'draw', LOSS: 'loss'}[wdl]}  {plies} plies"
+          + (f"  best {move_name(best[0])}" if best else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
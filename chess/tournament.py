@@ -0,0 +1,165 @@
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from chess.board import Board
+from chess.ai import Engine
+from chess.epd import read_epd
+from chess.moves import move_name
+from chess.ordering import MoveOrderer
+from chess.status import GameTracker
+
+EngineSpec = namedtuple("EngineSpec", "name time depth hash plain")
+Score = namedtuple("Score", "games wins draws losses elo margin")
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+DEFAULT_MAX_PLIES = 300
+
+
+def parse_spec(text):
+    # "depth=3,time=0.1,hash=8,plain" -> EngineSpec; the text itself is the engine's name.
+    settings = {"time": 0.1, "depth": 64, "hash": 8, "plain": False}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        key, _, value = item.partition("=")
+        if key not in settings:
+            raise ValueError(f"unknown engine setting: {key}")
+        if key == "plain":
+            if value.lower() not in ("", "1", "true", "0", "false"):
+                raise ValueError(f"plain takes true or false, not {value}")
+            settings[key] = value.lower() in ("", "1", "true")
+        else:
+            settings[key] = type(settings[key])(value)
+    return EngineSpec(text, settings["time"], settings["depth"], settings["hash"], settings["plain"])
+
+
+def make_engine(spec):
+    orderer = MoveOrderer(killers=False, history=False, use_see=False) if spec.plain else None
+    return Engine(spec.hash, orderer)
+
+
+def play_game(number, fen, white, black, max_plies=DEFAULT_MAX_PLIES):
+    board = Board.from_fen(fen)
+    engines = {"white": make_engine(white), "black": make_engine(black)}
+    specs = {"white": white, "black": black}
+    tracker = GameTracker(board)
+    moves = []
+    start = time.perf_counter()
+    while True:
+        decided = tracker.status()
+        if decided is not None:
+            result, reason = decided
+            break
+        if len(moves) >= max_plies:
+            result, reason = "1/2-1/2", "ply limit"
+            break
+        spec = specs[board.turn]
+        move = engines[board.turn].search(board, spec.time, spec.depth).move
+        board.make_move(move)
+        moves.append(move_name(move))
+    return {"game": number, "opening": fen, "white": white.name, "black": black.name, "result": result,
+            "reason": reason, "plies": len(moves), "moves": " ".join(moves),
+            "seconds": round(time.perf_counter() - start, 3)}
+
+
+def _play_job(job):
+    return play_game(*job)
+
+
+def schedule(openings, first, second, games, seed=0):
+    # Each randomly drawn opening is played twice with colours reversed, so neither engine gets the better side.
+    rng = random.Random(seed)
+    jobs = []
+    order = []
+    while len(jobs) < games:
+        if not order:
+            order = openings[:]
+            rng.shuffle(order)
+        fen = order.pop()
+        jobs.append((len(jobs) + 1, fen, first, second))
+        if len(jobs) < games:
+            jobs.append((len(jobs) + 1, fen, second, first))
+    return jobs
+
+
+def score(results, name):
+    # Elo difference for `name` with a 95% error margin from the per-game score variance.
+    wins = draws = losses = 0
+    for result in results:
+        if result["result"] == "1/2-1/2":
+            draws += 1
+        elif (result["result"] == "1-0") == (result["white"] == name):
+            wins += 1
+        else:
+            losses += 1
+    games = wins + draws + losses
+    if not games:
+        return Score(0, 0, 0, 0, 0.0, 0.0)
+    mean = (wins + draws / 2) / games
+    deviation = math.sqrt((wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / games)
+    spread = 1.96 * deviation / math.sqrt(games)
+    low, high = elo(mean - spread), elo(mean + spread)
+    return Score(games, wins, draws, losses, elo(mean), (high - low) / 2)
+
+
+def elo(mean):
+    mean = min(max(mean, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / mean - 1)
+
+
+def run_tournament(first, second, games, openings=None, workers=None, out=None, max_plies=DEFAULT_MAX_PLIES, seed=0,
+                   progress=None):
+    # Games run across a process pool; each result is appended to `out` as a JSON line when it finishes.
+    openings = [fen for _, fen, _ in read_epd(openings)] if openings else [START_FEN]
+    jobs = [job + (max_plies,) for job in schedule(openings, first, second, games, seed)]
+    results = []
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        for future in as_completed([pool.submit(_play_job, job) for job in jobs]):
+            result = future.result()
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+            if progress is not None:
+                progress(result, score(results, first.name))
+    return score(results, first.name), results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess.tournament", description="Engine-vs-engine self-play match.")
+    parser.add_argument("first", help='engine settings, e.g. "depth=3" or "time=0.05,hash=16,plain"')
+    parser.add_argument("second")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--openings", default=None, help="EPD/FEN file of start positions, drawn at random")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="tournament.jsonl", help="results, one JSON object per game")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="adjudicate a draw after this many")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    first, second = parse_spec(args.first), parse_spec(args.second)
+    if first.name == second.name:
+        parser.error("the two engines need different settings")
+
+    def progress(result, current):
+        print(f"game {result['game']:>5}  {result['white']} vs {result['black']}  {result['result']:<7} "
+              f"{result['reason']:<22} {current.games:>5} played  "
+              f"Elo {current.elo:+.1f} ± {current.margin:.1f}", flush=True)
+
+    start = time.perf_counter()
+    with open(args.out, "a") as out:
+        final, _ = run_tournament(first, second, args.games, args.openings, args.workers, out, args.max_plies,
+                                  args.seed, progress)
+    print(f"{first.name} vs {second.name}: +{final.wins} ={final.draws} -{final.losses}  "
+          f"Elo {final.elo:+.1f} ± {final.margin:.1f}  ({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
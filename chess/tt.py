@@ -0,0 +1,127 @@
+EXACT, LOWER, UPPER = 1, 2, 3
+
+ENTRY_BYTES = 16
+BUCKET_BYTES = 2 * ENTRY_BYTES
+SCORE_OFFSET = 1 << 15
+MASK_64 = (1 << 64) - 1
+
+
+def _pack(depth, score, bound, move, generation):
+    return (move & 0xfffff
+            | (score + SCORE_OFFSET & 0xffff) << 20
+            | (depth & 0xff) << 36
+            | bound << 44
+            | (generation & 0xff) << 46)
+
+
+def _unpack(data):
+    return (data >> 36 & 0xff,
+            (data >> 20 & 0xffff) - SCORE_OFFSET,
+            data >> 44 & 3,
+            data & 0xfffff)
+
+
+class TranspositionTable:
+    # Each bucket holds a depth-preferred slot followed by an always-replace
+    # slot. A slot is two 64-bit words, the key XOR-ed with the data and the
+    # data itself, so a torn write from another process reads as a miss.
+
+    def __init__(self, size_mb=16, buffer=None):
+        buckets = max(1, size_mb * 1024 * 1024 // BUCKET_BYTES)
+        self.buckets = 1 << (buckets.bit_length() - 1)
+        if buffer is None:
+            buffer = bytearray(self.buckets * BUCKET_BYTES)
+        self.buffer = buffer
+        self.table = memoryview(buffer).cast("Q")
+        self.mask = self.buckets - 1
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    @staticmethod
+    def bytes_for(size_mb):
+        buckets = max(1, size_mb * 1024 * 1024 // BUCKET_BYTES)
+        return (1 << (buckets.bit_length() - 1)) * BUCKET_BYTES
+
+    def release(self):
+        self.table.release()
+        if isinstance(self.buffer, memoryview):
+            self.buffer.release()
+
+    def clear(self):
+        raw = memoryview(self.buffer).cast("B")
+        raw[:] = bytes(len(raw))
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    def new_search(self):
+        self.generation = (self.generation + 1) & 0xff
+
+    def probe(self, key):
+        table = self.table
+        base = (key & self.mask) << 2
+        for slot in (base, base + 2):
+            data = table[slot + 1]
+            if data and table[slot] ^ data == key:
+                self.hits += 1
+                return _unpack(data)
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move=0):
+        table = self.table
+        base = (key & self.mask) << 2
+        data = _pack(depth, score, bound, move, self.generation)
+        self.stores += 1
+
+        old = table[base + 1]
+        if old and table[base] ^ old == key:
+            # Keep the best move of an earlier result when the new one has none.
+            if not move:
+                data |= old & 0xfffff
+            if depth >= (old >> 36 & 0xff) or bound == EXACT:
+                self._write(base, key, data)
+            return
+        if not old or depth >= (old >> 36 & 0xff) or (old >> 46 & 0xff) != self.generation:
+            if old:
+                self.overwrites += 1
+            self._write(base, key, data)
+            return
+
+        old = table[base + 3]
+        if old:
+            if table[base + 2] ^ old == key:
+                if not move:
+                    data |= old & 0xfffff
+            else:
+                self.overwrites += 1
+        self._write(base + 2, key, data)
+
+    def _write(self, slot, key, data):
+        self.table[slot] = (key ^ data) & MASK_64
+        self.table[slot + 1] = data
+
+    def hashfull(self):
+        sample = min(self.buckets, 500)
+        used = 0
+        for bucket in range(sample):
+            used += (self.table[bucket * 4 + 1] != 0) + (self.table[bucket * 4 + 3] != 0)
+        return used * 1000 // (sample * 2)
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size_bytes": self.buckets * BUCKET_BYTES,
+            "entries": self.buckets * 2,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hashfull": self.hashfull(),
+        }
@@ -0,0 +1,24 @@
+import random
+
+from chess.bitboard import BLACK, COLOR_INDEX, iter_bits
+
+_rng = random.Random(0x5EED)
+
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+CASTLING_KEYS = [0] + [_rng.getrandbits(64) for _ in range(15)]
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+SIDE_KEY = _rng.getrandbits(64)
+
+
+def compute_key(board):
+    key = 0
+    for code, bb in enumerate(board.bitboards):
+        keys = PIECE_KEYS[code]
+        for sq in iter_bits(bb):
+            key ^= keys[sq]
+    key ^= CASTLING_KEYS[board.castling]
+    if board.en_passant is not None:
+        key ^= EN_PASSANT_KEYS[board.en_passant & 7]
+    if COLOR_INDEX[board.turn] == BLACK:
+        key ^= SIDE_KEY
+    return key
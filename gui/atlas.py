@@ -0,0 +1,52 @@
+import os
+
+import pygame
+from chess.bitboard import COLORS
+
+PIECE_NAMES = ["pawn", "knight", "bishop", "rook", "queen", "king"]
+ASSET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "chess3d")
+
+# Scaled sprite lists already built in this process, keyed by square size.
+_sprites = {}
+
+
+def asset_paths():
+    # Listed in piece-code order: white pawn..king, then black pawn..king.
+    return [os.path.join(ASSET_DIR, f"{color}_{name}.png") for color in COLORS for name in PIECE_NAMES]
+
+
+def cache_path(size, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"atlas_{size}.png")
+
+
+def build_atlas(size):
+    atlas = pygame.Surface((size * len(PIECE_NAMES) * 2, size), pygame.SRCALPHA)
+    for code, path in enumerate(asset_paths()):
+        image = pygame.image.load(path)
+        atlas.blit(pygame.transform.scale(image, (size, size)), (code * size, 0))
+    return atlas
+
+
+def load_atlas(size, cache_dir=CACHE_DIR):
+    path = cache_path(size, cache_dir)
+    newest_source = max(os.path.getmtime(source) for source in asset_paths())
+    if os.path.exists(path) and os.path.getmtime(path) >= newest_source:
+        atlas = pygame.image.load(path)
+    else:
+        atlas = build_atlas(size)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            pygame.image.save(atlas, path)
+        except (OSError, pygame.error):
+            pass
+    return atlas.convert_alpha()
+
+
+def load_sprites(size, cache_dir=CACHE_DIR):
+    sprites = _sprites.get(size)
+    if sprites is None:
+        atlas = load_atlas(size, cache_dir)
+        sprites = [atlas.subsurface((code * size, 0, size, size)) for code in range(len(PIECE_NAMES) * 2)]
+        _sprites[size] = sprites
+    return sprites
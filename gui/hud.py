@@ -0,0 +1,86 @@
+import time
+
+import pygame
+from chess import instrument
+
+HUD_COLOR = (255, 255, 255)
+HUD_BACKGROUND = (0, 0, 0, 170)
+REFRESH_SECONDS = 0.5
+COUNTERS = ("valid_moves", "is_check", "is_checkmate", "find_king", "movegen")
+
+
+class Hud:
+    # Performance overlay: frame time split into render and highlight work, rules
+    # calls per frame and engine speed. Instrumentation is only on while it is shown.
+
+    def __init__(self):
+        self.visible = False
+        self.font = None
+        self.surface = None
+        self.rect = None
+        self.frames = 0
+        self.frame_ms = 0.0
+        self.window_start = 0.0
+        self.nps = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            instrument.reset()
+            instrument.enable()
+            self._start_window()
+        else:
+            instrument.disable()
+            # Nothing is on screen until frame() renders a fresh overlay.
+            self.surface = None
+            self.rect = None
+
+    def _start_window(self):
+        self.frames = 0
+        self.frame_ms = 0.0
+        self.window_start = time.perf_counter()
+
+    def frame(self, work_ms):
+        # Returns True when a fresh overlay has been rendered and needs drawing.
+        if not self.visible:
+            return False
+        self.frames += 1
+        self.frame_ms += work_ms
+        if self.surface is not None and time.perf_counter() - self.window_start < REFRESH_SECONDS:
+            return False
+        self.surface = self.render(self.lines(instrument.snapshot()))
+        instrument.reset()
+        self._start_window()
+        return True
+
+    def lines(self, stats):
+        frames = max(self.frames, 1)
+        ms, counts = stats["ms"], stats["counts"]
+        if stats["last_nps"]:
+            self.nps = stats["last_nps"]
+        fps = frames / max(time.perf_counter() - self.window_start, 1e-9)
+        lines = [f"frame {self.frame_ms / frames:.2f} ms  ({fps:.0f} fps)",
+                 f"render {ms.get('render', 0.0) / frames:.2f} ms  highlights {ms.get('highlights', 0.0) / frames:.2f} ms",
+                 "  ".join(f"{name} {counts.get(name, 0) / frames:.1f}" for name in COUNTERS) + "  per frame",
+                 f"engine {self.nps:,.0f} nps"]
+        if counts.get("nodes"):
+            lines[-1] += f"  nodes {counts['nodes']:,}  tt hits {counts.get('tt_hits', 0):,}"
+        return lines
+
+    def render(self, lines):
+        if self.font is None:
+            self.font = pygame.font.SysFont(None, 22)
+        rendered = [self.font.render(line, True, HUD_COLOR) for line in lines]
+        width = max(text.get_width() for text in rendered) + 12
+        height = sum(text.get_height() for text in rendered) + 10
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(HUD_BACKGROUND)
+        y = 5
+        for text in rendered:
+            surface.blit(text, (6, y))
+            y += text.get_height()
+        return surface
+
+    def draw(self, win):
+        self.rect = win.blit(self.surface, (4, 4))
+        return self.rect
@@ -0,0 +1,73 @@
+import pygame
+from chess.rules import Rules
+from chess.utils import opponent
+
+WIDTH, HEIGHT = 800, 800  
+ROWS, COLS = 8, 8         
+SQUARE_SIZE = WIDTH // COLS
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+LIGHT_BROWN = (240, 217, 181)
+DARK_BROWN = (181, 136, 99)
+HIGHLIGHT_COLOR = (50, 205, 50, 128) 
+CAPTURE_COLOR = (255, 0, 0, 128)      
+
+def draw_board(win, size=SQUARE_SIZE):
+    for row in range(ROWS):
+        for col in range(COLS):
+            color = LIGHT_BROWN if (row + col) % 2 == 0 else DARK_BROWN
+            pygame.draw.rect(win, color, (col * size, row * size, size, size))
+
+def render_board_surface(size=SQUARE_SIZE):
+    surface = pygame.Surface((COLS * size, ROWS * size)).convert()
+    draw_board(surface, size)
+    return surface
+
+def square_rect(row, col, size=SQUARE_SIZE):
+    return pygame.Rect(col * size, row * size, size, size)
+
+def compute_highlights(board, selected_pos, turn):
+    highlights = {}
+    if selected_pos is None:
+        return highlights
+
+    # Attack-map lookups: the king and whatever is checking it.
+    king_position = board.find_king(turn)
+    if king_position and Rules.is_square_attacked(board, king_position, opponent(turn)):
+        highlights[king_position] = CAPTURE_COLOR
+        for checker in Rules.get_attackers(board, king_position, opponent(turn)):
+            highlights[checker] = CAPTURE_COLOR
+
+    for row, col in board.legal_targets(selected_pos):
+        target_piece = board.board[row][col]
+        highlights[(row, col)] = CAPTURE_COLOR if target_piece is not None else HIGHLIGHT_COLOR
+    return highlights
+
+def draw_square(win, background, board, sprites, highlights, overlay, row, col):
+    rect = square_rect(row, col, overlay.get_width())
+    win.blit(background, rect, rect)
+    color = highlights.get((row, col))
+    if color:
+        overlay.fill(color)
+        win.blit(overlay, rect)
+    piece = board.board[row][col]
+    if piece is not None:
+        win.blit(sprites[piece.code], rect)
+    return rect
+
+def forget_squares(drawn, rect, size=SQUARE_SIZE):
+    # Marks the squares under rect as stale so the next redraw paints over whatever covered them.
+    for row, col in list(drawn):
+        if square_rect(row, col, size).colliderect(rect):
+            del drawn[(row, col)]
+
+def redraw_changed_squares(win, background, board, sprites, highlights, overlay, drawn):
+    dirty = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            state = (board.board[row][col], highlights.get((row, col)))
+            if drawn.get((row, col)) != state:
+                drawn[(row, col)] = state
+                dirty.append(draw_square(win, background, board, sprites, highlights, overlay, row, col))
+    return dirty
@@ -0,0 +1,28 @@
+from chess.ai import Engine, MATE_BOUND
+from chess.board import Board
+from chess.moves import move_name
+
+
+def test_finds_mate_in_one():
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    result = Engine(hash_mb=1).search(board, time_limit=5)
+    assert move_name(result.move) == "a1a8"
+    assert result.score >= MATE_BOUND
+
+
+def test_respects_time_budget_and_reports_speed():
+    board = Board()
+    board.setup()
+    key = board.key
+    result = Engine(hash_mb=1).search(board, time_limit=0.3)
+    assert result.move in board.legal_moves()
+    assert result.elapsed < 1.0
+    assert result.nodes > 0 and result.nps > 0
+    assert result.pv and result.pv[0] == result.move
+    assert board.key == key and not board.history
+
+
+def test_wins_hanging_queen():
+    board = Board.from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+    result = Engine(hash_mb=1).search(board, time_limit=5, max_depth=3)
+    assert move_name(result.move) == "d1d5"
@@ -0,0 +1,93 @@
+import pytest
+
+from chess.board import Board
+from chess.archive import (POSITION_SIZE, Archive, ArchiveWriter, game_positions, pack_position,
+                           unpack_position, save_game, load_game)
+from chess.perft import REFERENCE_POSITIONS
+
+
+def test_pack_round_trip():
+    for name, fen, counts in REFERENCE_POSITIONS:
+        board = Board.from_fen(fen)
+        packed = pack_position(board)
+        assert len(packed) == POSITION_SIZE
+        restored = unpack_position(packed)
+        assert restored.fen() == fen, name
+        assert restored.key == board.key
+
+
+def test_archive_random_access(tmp_path):
+    path = str(tmp_path / "positions.chsa")
+    boards = [Board.from_fen(fen) for _, fen, _ in REFERENCE_POSITIONS]
+    with ArchiveWriter(path) as writer:
+        for board in boards:
+            writer.add_board(board)
+    with ArchiveWriter(path) as writer:
+        assert writer.add_board(boards[0]) == len(boards)
+
+    with Archive(path) as archive:
+        assert len(archive) == archive.games() == len(boards) + 1
+        assert archive[3].fen() == boards[3].fen()
+        assert archive[-1].fen() == boards[0].fen()
+        assert list(archive.scan())[1] == pack_position(boards[1])
+
+
+def test_save_and_load_game_keeps_undo_history(tmp_path):
+    path = str(tmp_path / "saves.chsa")
+    board = Board()
+    board.setup()
+    for move in ["e2 e4", "d7 d5", "e4 d5", "g8 f6"]:
+        board.apply_move(move)
+    save_game(board, path)
+
+    loaded = load_game(path)
+    assert loaded.fen() == board.fen()
+    assert len(loaded.history) == 4
+    loaded.unmake_move()
+    loaded.unmake_move()
+    assert loaded.fen() == "rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+
+
+def test_restore_game_reaches_the_last_position_past_a_gap(tmp_path):
+    path = str(tmp_path / "saves.chsa")
+    board = Board()
+    board.setup()
+    for move in ["e2 e4", "e7 e5", "g1 f3", "b8 c6", "f1 b5"]:
+        board.apply_move(move)
+    positions = game_positions(board)
+    with ArchiveWriter(path) as writer:
+        writer.add_game(positions[:2] + positions[3:])
+
+    loaded = load_game(path)
+    assert loaded.fen() == board.fen()
+    assert len(loaded.history) == 2
+    loaded.unmake_move()
+    loaded.unmake_move()
+    assert pack_position(loaded) == positions[3]
+
+
+def test_failed_append_leaves_the_archive_readable(tmp_path):
+    path = str(tmp_path / "positions.chsa")
+    board = Board()
+    board.setup()
+    with ArchiveWriter(path) as writer:
+        writer.add_board(board)
+    try:
+        with ArchiveWriter(path) as writer:
+            writer.add_board(board)
+            raise RuntimeError("interrupted")
+    except RuntimeError:
+        pass
+    with Archive(path) as archive:
+        assert archive.games() == 1 and archive[0].fen() == board.fen()
+    assert not (tmp_path / "positions.chsa.tmp").exists()
+
+
+def test_appending_to_a_corrupt_archive_raises(tmp_path):
+    path = tmp_path / "positions.chsa"
+    path.write_bytes(b"CHSARC1\0" + b"\xff" * 20)
+    board = Board()
+    board.setup()
+    with pytest.raises(ValueError):
+        save_game(board, str(path))
+    assert not (tmp_path / "positions.chsa.tmp").exists()
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gui.atlas import build_atlas, cache_path, load_atlas
+
+
+@pytest.fixture
+def display():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((8, 8))
+    yield
+    pygame.display.quit()
+
+
+def test_atlas_cached_per_square_size(display, tmp_path):
+    atlas = load_atlas(40, str(tmp_path))
+    assert atlas.get_size() == (40 * 12, 40)
+    assert os.path.exists(cache_path(40, str(tmp_path)))
+    assert not os.path.exists(cache_path(50, str(tmp_path)))
+
+    cached = load_atlas(40, str(tmp_path))
+    fresh = build_atlas(40)
+    for code in range(12):
+        x = code * 40 + 20
+        assert cached.get_at((x, 20)) == fresh.get_at((x, 20))
@@ -0,0 +1,49 @@
+import random
+
+from chess.board import Board
+from chess.attackmap import AttackMap
+from chess.attacks import attackers_to
+from chess.rules import Rules
+
+
+def assert_matches_rebuild(board):
+    tracked, fresh = board.attack_map, AttackMap(board)
+    assert tracked.attacks == fresh.attacks
+    assert tracked.attacked_by == fresh.attacked_by
+    assert tracked.counts == fresh.counts and tracked.attacked == fresh.attacked
+    for sq in range(64):
+        for side in (0, 1):
+            assert tracked.attackers(sq, side) == attackers_to(board, sq, side)
+
+
+def test_incremental_updates_match_a_rebuild():
+    rng = random.Random(7)
+    for _ in range(10):
+        board = Board()
+        board.setup()
+        board.track_attacks()
+        for _ in range(80):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            assert_matches_rebuild(board)
+            if rng.random() < 0.25:
+                board.unmake_move()
+                assert_matches_rebuild(board)
+
+
+def test_counts_and_checking_piece():
+    board = Board()
+    board.setup()
+    attacks = board.track_attacks()
+    # f3 is covered by the g2 and e2 pawns and the g1 knight.
+    assert attacks.counts[0][45] == 3
+    assert not board.copy().attack_map
+
+    for move in ["e2 e4", "f7 f6", "d1 h5"]:
+        board.apply_move(move)
+    king = board.find_king("black")
+    assert Rules.is_check(board, king, "black")
+    assert Rules.get_checking_piece_position(board, king, "black") == (3, 7)
+    assert Rules.get_checking_piece_position(board, board.find_king("white"), "white") == (None, None)
@@ -0,0 +1,69 @@
+import time
+
+from chess.ai import Engine
+from chess.background import BackgroundEngine
+from chess.board import Board
+
+
+def start():
+    board = Board()
+    board.setup()
+    return board
+
+
+def test_think_reports_progress_and_can_be_cancelled():
+    board = start()
+    seen = []
+    background = BackgroundEngine(Engine(hash_mb=1), time_limit=0, callback=seen.append)
+    handle = background.think(board)
+    time.sleep(0.3)
+    assert not handle.done()
+    result = handle.cancel()
+    assert handle.done() and result.move in board.legal_moves()
+    assert seen and handle.progress is seen[-1]
+    assert board.fen() == start().fen()
+
+
+def test_ponder_hit_keeps_the_running_search():
+    board = start()
+    background = BackgroundEngine(Engine(hash_mb=1), time_limit=0.3, max_depth=3)
+    result = background.think(board).result()
+    board.make_move(result.move)
+    pondering = background.ponder(board, result.pv)
+    assert pondering is not None
+    board.make_move(result.pv[1])
+    assert background.think(board) is pondering
+    assert background.ponder_hits == 1
+    assert pondering.result(timeout=5).move in board.legal_moves()
+
+
+def test_ponder_miss_starts_a_new_search():
+    board = start()
+    background = BackgroundEngine(Engine(hash_mb=1), time_limit=0.2, max_depth=3)
+    result = background.think(board).result()
+    board.make_move(result.move)
+    pondering = background.ponder(board, result.pv)
+    other = next(move for move in board.legal_moves() if move != result.pv[1])
+    board.make_move(other)
+    handle = background.think(board)
+    assert handle is not pondering and pondering.done()
+    assert background.ponder_hits == 0
+    assert handle.result(timeout=5).move in board.legal_moves()
+
+
+def test_ponderhit_puts_an_untimed_search_on_the_clock():
+    engine = Engine(hash_mb=1)
+    background = BackgroundEngine(engine, time_limit=0)
+    handle = background.think(start())
+    time.sleep(0.2)
+    engine.ponderhit(0.2)
+    assert handle.result(timeout=3) is not None and handle.done()
+
+
+def test_ponderhit_before_the_search_starts_is_kept():
+    engine = Engine(hash_mb=1)
+    board = start()
+    engine.ponderhit(0.2)
+    began = time.perf_counter()
+    assert engine.search(board, 0).move in board.legal_moves()
+    assert time.perf_counter() - began < 3
@@ -1,8 +1,79 @@
+import pickle
+
 import pytest
 from chess.board import Board
+from chess.pieces import Pawn, King, PIECES
+from chess.moves import move_from_positions, move_name
+from chess.zobrist import compute_key
 
 def test_setup():
     board = Board()
     board.setup()
-    assert board.board[1][0] == ('P', 'black')  # Pawn
-    assert board.board[7][4] == ('K', 'white')  # King
+    piece = board.board[1][0]
+    assert isinstance(piece, Pawn) and piece.color == 'black'  # Pawn
+    piece = board.board[7][4]
+    assert isinstance(piece, King) and piece.color == 'white'  # King
+
+def test_pieces_are_shared_flyweights():
+    board = Board()
+    board.setup()
+    assert board.board[6][0] is board.board[6][7] is Pawn("white") is PIECES[Pawn("white").code]
+    assert pickle.loads(pickle.dumps(board.board[7][4])) is King("white")
+    with pytest.raises(AttributeError):
+        Pawn("white").color = "black"
+    with pytest.raises(AttributeError):
+        Pawn("white").has_moved = True
+
+def test_bitboards_follow_moves():
+    board = Board()
+    board.setup()
+    assert board.occupied == 0xffff00000000ffff
+    assert board.find_king("white") == (7, 4)
+    board.move_piece((7, 4), (4, 4))
+    assert board.find_king("white") == (4, 4)
+    assert board.is_empty((7, 4))
+    assert not board.is_empty((4, 4))
+
+def test_make_unmake_restores_position():
+    board = Board()
+    board.setup()
+    before = (board.bitboards[:], board.occupied, board.turn)
+    record = board.make_move(move_from_positions((6, 4), (4, 4)))
+    assert board.has_moved((4, 4)) and not board.has_moved((6, 3))
+    assert board.turn == "black"
+    board.make_move(move_from_positions((1, 3), (3, 3)))
+    board.make_move(move_from_positions((4, 4), (3, 3)))
+    assert len(board.history) == 3
+    board.unmake_move()
+    board.unmake_move()
+    board.unmake_move(record)
+    assert (board.bitboards, board.occupied, board.turn) == before
+    assert not board.has_moved((6, 4))
+
+def test_zobrist_key_is_incremental():
+    board = Board()
+    board.setup()
+    start = board.key
+    for move in ["g1 f3", "g8 f6", "f3 g1", "f6 g8"]:
+        board.apply_move(move)
+    assert board.key == start == compute_key(board)
+    board.apply_move("e2 e4")
+    assert board.key != start
+    assert board.key == compute_key(board)
+    board.unmake_move()
+    assert board.key == start
+
+def test_fen_drops_castling_rights_without_king_and_rook():
+    board = Board.from_fen("4k3/8/8/8/8/8/8/4K3 w K - 0 1")
+    assert board.castling == 0 and board.fen() == "4k3/8/8/8/8/8/8/4K3 w - - 0 1"
+    assert "e1g1" not in [move_name(move) for move in board.legal_moves()]
+    board = Board.from_fen("r3k3/8/8/8/8/8/8/4K2R w KQkq - 0 1")
+    assert board.fen() == "r3k3/8/8/8/8/8/8/4K2R w Kq - 0 1"
+    assert Board.from_fen("4k3/8/8/8/8/8/8/R3K2r w KQ - 0 1").fen().split()[2] == "Q"
+
+
+@pytest.mark.parametrize("fen", ["8/8/8/8/8/8/8/4K3 w - - 0 1", "4k3/8/8/8/8/8/8/4K2K w - - 0 1",
+                                 "4k3/8/8/8/8/8/8/3PK3 w - - 0 1", "3pk3/8/8/8/8/8/8/4K3 b - - 0 1"])
+def test_fen_needs_one_king_a_side_and_no_back_rank_pawns(fen):
+    with pytest.raises(ValueError, match="invalid FEN"):
+        Board.from_fen(fen)
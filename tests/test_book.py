@@ -0,0 +1,62 @@
+import io
+
+from chess.board import Board
+from chess.ai import Engine
+from chess.book import ENTRY, Book, build_book, polyglot_move
+from chess.moves import move_name
+
+PGN = """[Result "1-0"]
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 1-0
+
+[Result "1/2-1/2"]
+1. e4 c5 2. Nf3 d6 1/2-1/2
+
+[Result "0-1"]
+1. d4 d5 2. c4 e6 0-1
+
+[Result "1-0"]
+1. e4 e5 2. Nf3 Nf6 3. O-O 1-0
+"""
+
+
+def start():
+    board = Board()
+    board.setup()
+    return board
+
+
+def test_build_and_probe(tmp_path):
+    path = str(tmp_path / "book.bin")
+    games, entries = build_book(io.StringIO(PGN), path, max_ply=4)
+    assert games == 4
+    data = open(path, "rb").read()
+    assert len(data) == entries * ENTRY.size
+    keys = [key for key, _, _, _ in ENTRY.iter_unpack(data)]
+    assert keys == sorted(keys)
+
+    board = start()
+    with Book(path) as book:
+        assert dict((move_name(move), weight) for move, weight in book.moves(board)) == {"e2e4": 5}
+        assert move_name(book.probe(board)) == "e2e4"
+        board.apply_move("e2 e4")
+        # e7e5 only ever lost, so it carries no weight.
+        assert [move_name(move) for move, _ in book.moves(board)] == ["c7c5"]
+        assert len(book.entries(board.key)) == 2
+        board.apply_move("a7 a6")
+        assert book.probe(board) is None
+
+
+def test_polyglot_castling_encoding():
+    board = Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    castles = [move for move in board.legal_moves() if move >> 15 == 3]
+    # e1h1 and e1a1 in Polyglot's rank-1-based numbering.
+    assert sorted(polyglot_move(move) for move in castles) == [4 << 6 | 0, 4 << 6 | 7]
+
+
+def test_engine_plays_book_move_without_searching(tmp_path):
+    path = str(tmp_path / "book.bin")
+    build_book(io.StringIO(PGN), path)
+    with Book(path) as book:
+        result = Engine(hash_mb=1, book=book).search(start(), time_limit=5)
+    assert move_name(result.move) == "e2e4"
+    assert result.nodes == 0
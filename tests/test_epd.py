@@ -0,0 +1,42 @@
+import io
+
+from chess.board import Board
+from chess.epd import parse_epd, read_epd, perft_positions, search_positions
+from chess.perft import REFERENCE_POSITIONS
+
+
+def test_fen_round_trip():
+    for name, fen, counts in REFERENCE_POSITIONS:
+        assert Board.from_fen(fen).fen() == fen, name
+    board = Board()
+    board.setup()
+    board.apply_move("e2 e4")
+    assert board.fen() == "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+
+
+def test_parse_epd_layouts():
+    fen, operations = parse_epd("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - ;D1 20 ;D2 400")
+    assert fen == REFERENCE_POSITIONS[0][1]
+    assert operations == {"D1": "20", "D2": "400"}
+    fen, operations = parse_epd('6k1/5ppp/8/8/8/8/8/R5K1 w - - hmvc 3; fmvn 40; bm Ra8#; id "mate";')
+    assert fen == "6k1/5ppp/8/8/8/8/8/R5K1 w - - 3 40"
+    assert operations["bm"] == "Ra8#" and operations["id"] == "mate"
+
+
+def test_streaming_perft_runner():
+    lines = (f"{fen} ;D1 {counts[0]} ;D2 {counts[1]}\n" for _, fen, counts in REFERENCE_POSITIONS)
+    out = io.StringIO()
+    positions, failures, nodes, _ = perft_positions(read_epd(lines), out=out)
+    assert (positions, failures) == (len(REFERENCE_POSITIONS), 0)
+    assert out.getvalue().count("ok") == positions
+
+    out = io.StringIO()
+    assert perft_positions(read_epd([REFERENCE_POSITIONS[0][1] + " ;D1 21"]), out=out)[1] == 1
+    assert "FAIL" in out.getvalue()
+
+
+def test_search_runner():
+    out = io.StringIO()
+    positions, _, _ = search_positions(read_epd(['6k1/5ppp/8/8/8/8/8/R5K1 w - - bm Ra8#;']), 1.0, 3, 1, out)
+    assert positions == 1
+    assert out.getvalue().startswith("1: a1a8")
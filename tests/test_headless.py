@@ -0,0 +1,10 @@
+import subprocess
+import sys
+
+
+def test_core_does_not_import_pygame():
+    code = ("import sys, chess.board, chess.rules, chess.ai, chess.perft, chess.parallel, chess.instrument, chess.background, "
+            "chess.status; "
+            "print('pygame' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from chess import instrument
+from gui.hud import Hud
+
+
+@pytest.fixture
+def display():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    yield pygame.display.set_mode((200, 200))
+    instrument.disable()
+    pygame.font.quit()
+    pygame.display.quit()
+
+
+def test_toggle_on_off_on(display):
+    hud = Hud()
+    for _ in range(2):
+        hud.toggle()
+        assert hud.visible and hud.surface is None and hud.rect is None
+        assert hud.frame(1.0)
+        assert hud.draw(display) == hud.rect
+        hud.toggle()
+        assert not hud.visible and hud.surface is None and hud.rect is None
+        assert not hud.frame(1.0)
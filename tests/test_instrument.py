@@ -0,0 +1,41 @@
+from chess import instrument
+from chess.ai import Engine
+from chess.board import Board
+from chess.rules import Rules
+
+
+def start():
+    board = Board()
+    board.setup()
+    return board
+
+
+def test_counts_rules_pieces_and_search():
+    board = start()
+    with instrument.profiling() as stats:
+        Rules.is_checkmate(board, board.find_king("white"), "white")
+        board.get_piece((7, 1)).valid_moves((7, 1), board)
+        board.get_piece((6, 4)).valid_moves((6, 4), board)
+        with instrument.timer("render"):
+            pass
+        Engine(hash_mb=1).search(board, time_limit=0, max_depth=2)
+    counts = stats["counts"]
+    assert counts["valid_moves"] == 2
+    assert counts["is_checkmate"] == 1 and counts["is_check"] >= 1
+    assert counts["find_king"] == 1
+    assert counts["render"] == 1 and counts["search"] == 1
+    assert counts["nodes"] > 20 and counts["movegen"] > 20
+    assert stats["ms"]["search"] > 0 and stats["nps"] > 0
+
+
+def test_disabled_leaves_original_functions():
+    originals = (Rules.__dict__["is_check"], Board.find_king, Engine.search)
+    with instrument.profiling():
+        assert Board.find_king is not originals[1]
+    assert not instrument.enabled
+    assert (Rules.__dict__["is_check"], Board.find_king, Engine.search) == originals
+    instrument.reset()
+    start().find_king("white")
+    with instrument.timer("render"):
+        pass
+    assert instrument.snapshot()["counts"] == {}
@@ -0,0 +1,35 @@
+from chess.board import Board
+from chess.moves import move_name
+from chess.ordering import MoveOrderer, see
+
+
+def find(board, name):
+    return next(move for move in board.legal_moves() if move_name(move) == name)
+
+
+def test_static_exchange_evaluation():
+    board = Board.from_fen("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1")
+    assert see(board, find(board, "e1e5")) == 100
+    board = Board.from_fen("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1")
+    assert see(board, find(board, "d3e5")) < 0
+
+
+def test_order_puts_tt_move_winning_captures_and_killers_first():
+    board = Board.from_fen("4k3/8/8/3q4/8/2N5/8/3RK3 w - - 0 1")
+    orderer = MoveOrderer()
+    quiet = find(board, "e1f1")
+    orderer.record_cutoff(board, quiet, 4, 1, 3)
+    tt_move = find(board, "c3b5")
+    ordered = orderer.order(board, board.legal_moves(), tt_move, ply=1)
+    assert ordered[0] == tt_move
+    assert [move_name(move) for move in ordered[1:3]] == ["c3d5", "d1d5"]
+    assert ordered[3] == quiet
+    assert orderer.stats()["cutoffs"] == 1
+
+
+def test_losing_captures_are_pruned_from_quiescence():
+    board = Board.from_fen("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+    orderer = MoveOrderer()
+    captures = [move for move in board.legal_moves() if board.occupied >> (move >> 6 & 63) & 1]
+    assert orderer.order_captures(board, captures) == []
+    assert orderer.see_pruned == 1
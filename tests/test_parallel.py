@@ -0,0 +1,19 @@
+from chess.board import Board
+from chess.parallel import ParallelSearch, parallel_perft, parallel_divide
+from chess.perft import REFERENCE_POSITIONS
+
+
+def test_parallel_perft_matches_reference():
+    name, fen, counts = REFERENCE_POSITIONS[1]
+    board = Board.from_fen(fen)
+    assert parallel_perft(board, 2, workers=2) == counts[1]
+    assert len(parallel_divide(board, 2, workers=2)) == counts[0]
+
+
+def test_parallel_search_shares_table():
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    with ParallelSearch(workers=2, hash_mb=1) as search:
+        result = search.search(board, time_limit=2)
+        assert result.move in board.legal_moves()
+        assert search.tt.stats()["stores"] > 0
+    assert not board.history
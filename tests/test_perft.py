@@ -0,0 +1,22 @@
+from chess.board import Board
+from chess.perft import REFERENCE_POSITIONS, perft, divide, run_reference
+
+
+def test_reference_counts():
+    for name, fen, counts in REFERENCE_POSITIONS:
+        board = Board.from_fen(fen)
+        for depth, expected in enumerate(counts[:2], 1):
+            assert perft(board, depth) == expected, (name, depth)
+
+
+def test_divide_sums_to_perft():
+    board = Board()
+    board.setup()
+    results = divide(board, 3)
+    assert len(results) == 20
+    assert sum(nodes for _, nodes in results) == 8902
+
+
+def test_run_reference(capsys):
+    assert run_reference(max_nodes=3000) == 0
+    assert "NPS" in capsys.readouterr().out
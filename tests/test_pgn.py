@@ -0,0 +1,67 @@
+import io
+
+import pytest
+from chess.board import Board
+from chess.pgn import parse_san, move_to_san, read_games, play_game, replay, replay_games
+from chess.perft import REFERENCE_POSITIONS
+
+PGN = """[Event "Opera Game"]
+[White "Morphy"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {This is a weak move
+already.} 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5
+10. Nxb5 cxb5 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 (13... Nxd7 14. Qb8+ $1) 14. Rd1 Qe6
+15. Bxd7+ Nxd7 16. Qb8+ Nxb8 17. Rd8# 1-0
+
+[Event "Short"]
+[FEN "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1"]
+
+1. exd6 Kd7 2. Kd2 Kxd6 ; the pawn is gone
+1/2-1/2
+"""
+
+
+def test_read_games_skips_comments_and_variations():
+    games = list(read_games(io.StringIO(PGN)))
+    assert len(games) == 2
+    assert games[0].headers["White"] == "Morphy"
+    assert games[0].result == "1-0"
+    assert len(games[0].moves) == 33
+    assert games[1].moves == ["exd6", "Kd7", "Kd2", "Kxd6"]
+
+
+def test_trusted_replay_matches_verified():
+    for game in read_games(io.StringIO(PGN)):
+        assert play_game(game, verify=True).fen() == play_game(game, verify=False).fen()
+    board = play_game(next(read_games(io.StringIO(PGN))))
+    assert board.fen().startswith("1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5 b k")
+
+    stats = replay_games(io.StringIO(PGN), verify=False)
+    assert (stats.games, stats.plies, stats.errors) == (2, 37, 0)
+
+
+def test_san_round_trip():
+    for name, fen, counts in REFERENCE_POSITIONS:
+        board = Board.from_fen(fen)
+        for move in board.legal_moves():
+            san = move_to_san(board, move)
+            assert parse_san(board, san) == move, (name, san)
+            assert parse_san(board, san, verify=False) == move, (name, san)
+
+
+def test_san_needs_pin_to_disambiguate():
+    # Both knights reach d2, but the one on e4 is pinned to its king.
+    board = Board.from_fen("4k3/4r3/8/8/4N3/8/8/1N2K3 w - - 0 1")
+    assert move_to_san(board, parse_san(board, "Nd2")) == "Nd2"
+    assert parse_san(board, "Nd2", verify=False) == parse_san(board, "Nd2")
+    with pytest.raises(ValueError):
+        parse_san(board, "Nf6")
+
+
+def test_replay_yields_position_before_each_move():
+    game = next(read_games(io.StringIO(PGN)))
+    seen = [(board.turn, move_to_san(board, move)) for board, move in replay(game)]
+    assert seen[0] == ("white", "e4")
+    assert seen[-1] == ("white", "Rd8#")
@@ -1,8 +1,43 @@
 from chess.board import Board
 from chess.rules import Rules
+from chess.pieces import King, Queen
 
 def test_validate_move():
     board = Board()
     board.setup()
-    assert Rules.validate_move(board, "e2 e4") == True
-    assert Rules.validate_move(board, "e3 e4") == False
+    assert Rules.validate_move(board, "e2 e4", "white") == True
+    assert Rules.validate_move(board, "e3 e4", "white") == False
+
+def test_is_square_attacked():
+    board = Board()
+    board.setup()
+    assert Rules.is_square_attacked(board, (5, 5), "white")
+    assert not Rules.is_square_attacked(board, (4, 4), "white")
+    for move in ["e2 e4", "e7 e5", "d1 h5", "b8 c6", "f1 c4", "g8 f6", "h5 f7"]:
+        board.apply_move(move)
+    assert Rules.is_check(board, board.find_king("black"), "black")
+    assert Rules.is_checkmate(board, board.find_king("black"), "black")
+
+def test_legal_moves_cover_special_moves():
+    board = Board()
+    board.setup()
+    assert len(board.legal_moves("white")) == 20
+    for move in ["e2 e4", "a7 a6", "e4 e5", "d7 d5"]:
+        board.apply_move(move)
+    board.apply_move("e5 d6")
+    assert board.get_piece((3, 3)) is None
+    board.unmake_move()
+    assert board.get_piece((3, 3)).color == "black"
+    for move in ["g1 f3", "a6 a5", "f1 e2", "a5 a4", "e1 g1"]:
+        board.apply_move(move)
+    assert board.get_piece((7, 5)).__class__.__name__ == "Rook"
+
+def test_stalemate():
+    board = Board()
+    board.clear()
+    board.place_piece((0, 0), King("black"))
+    board.place_piece((2, 1), Queen("white"))
+    board.place_piece((7, 7), King("white"))
+    board.turn = "black"
+    assert Rules.is_stalemate(board, "black")
+    assert not Rules.is_checkmate(board, (0, 0), "black")
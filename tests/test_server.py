@@ -0,0 +1,47 @@
+import asyncio
+
+from chess.loadgen import Connection, run_load
+from chess.server import DEFAULT_HOST, GameServer
+
+
+def with_server(scenario):
+    async def run():
+        server = GameServer(workers=1)
+        port = await server.start(DEFAULT_HOST, 0)
+        try:
+            return await scenario(port)
+        finally:
+            await server.stop()
+    return asyncio.run(run())
+
+
+def test_moves_are_validated_per_game():
+    async def scenario(port):
+        connection = await Connection.open(DEFAULT_HOST, port)
+        first = await connection.request("new")
+        second = await connection.request("new", fen="k7/8/1K6/8/8/8/8/7R w - - 0 1")
+        assert first["game"] != second["game"] and len(first["legal"]) == 20
+
+        reply = await connection.request("move", game=first["game"], move="e2e4")
+        assert reply["fen"].startswith("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b")
+        assert "error" in await connection.request("move", game=first["game"], move="e2e4")
+        assert "error" in await connection.request("move", game=99, move="e2e4")
+        assert "error" in await connection.request("bogus")
+
+        for limits in ({"time": 0}, {"time": -1}, {"time": "1"}, {"depth": 0}, {"depth": None}):
+            assert "error" in await connection.request("engine", game=second["game"], **limits)
+        reply = await connection.request("engine", game=second["game"], time=5, depth=2)
+        assert reply["move"] == "h1h8" and reply["status"] == "checkmate"
+        stats = await connection.request("stats")
+        assert stats["games"] == 2 and stats["move_p99_ms"] > 0
+        await connection.close()
+    with_server(scenario)
+
+
+def test_load_generator_reports_latency():
+    async def scenario(port):
+        return await run_load(DEFAULT_HOST, port, games=30, plies=6, connections=3, engine_time=5, engine_depth=1)
+    stats = with_server(scenario)
+    assert stats.errors == 0
+    assert stats.moves == len(stats.move_latencies) > 100
+    assert stats.engine_moves > 100
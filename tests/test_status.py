@@ -0,0 +1,45 @@
+from chess.board import Board
+from chess.moves import move_name
+from chess.status import GameTracker, Status, insufficient_material
+
+
+def play(board, *names):
+    for name in names:
+        board.make_move(next(move for move in board.legal_moves() if move_name(move) == name))
+
+
+def test_checkmate_and_stalemate():
+    assert GameTracker(Board.from_fen("k6R/8/1K6/8/8/8/8/8 b - - 0 1")).status() == Status("1-0", "checkmate")
+    assert GameTracker(Board.from_fen("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1")).status() == Status("1/2-1/2", "stalemate")
+
+
+def test_threefold_repetition_follows_make_and_unmake():
+    board = Board()
+    board.setup()
+    tracker = GameTracker(board)
+    shuffle = ("g1f3", "g8f6", "f3g1", "f6g8")
+    play(board, *shuffle)
+    assert tracker.repetitions() == 2 and tracker.status() is None
+    play(board, *shuffle)
+    assert tracker.status() == Status("1/2-1/2", "threefold repetition")
+    board.unmake_move()
+    assert tracker.status() is None and tracker.repetitions() == 2
+    play(board, "f6g8")
+    assert tracker.repetitions() == 3
+
+
+def test_fifty_move_rule():
+    board = Board.from_fen("k7/8/1K6/8/8/8/8/7R w - - 99 80")
+    tracker = GameTracker(board)
+    assert tracker.status() is None
+    play(board, "h1h2")
+    assert tracker.status() == Status("1/2-1/2", "fifty-move rule")
+
+
+def test_insufficient_material():
+    assert insufficient_material(Board.from_fen("k7/8/1K6/8/8/8/8/8 w - - 0 1"))
+    assert insufficient_material(Board.from_fen("k7/8/1K6/8/8/8/8/7N w - - 0 1"))
+    assert insufficient_material(Board.from_fen("k7/8/1KB5/8/8/8/8/1b6 w - - 0 1"))
+    assert not insufficient_material(Board.from_fen("k7/8/1KB5/8/8/8/8/b7 w - - 0 1"))
+    assert not insufficient_material(Board.from_fen("k7/8/1K6/8/8/8/8/6NN w - - 0 1"))
+    assert not insufficient_material(Board.from_fen("k7/8/1K6/8/8/8/P7/8 w - - 0 1"))
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+from chess.board import Board
+from chess.ai import Engine, MATE
+from chess.bitboard import WHITE, BLACK, PAWN, KING
+from chess.moves import move_name
+from chess.rules import Rules
+from chess.tablebase import (WIN, LOSS, DRAW, Layout, Tablebases, dependencies, generate_all, verify)
+
+
+@pytest.fixture(scope="module")
+def tablebases(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("tablebases"))
+    generate_all(["KRvK"], directory, workers=2, out=io.StringIO())
+    tables = Tablebases(directory)
+    yield tables
+    tables.close()
+
+
+def test_layout_index_round_trip():
+    layout = Layout("KPvK")
+    assert layout.pieces == [(KING, WHITE), (KING, BLACK), (PAWN, WHITE)]
+    for index in (0, 12345, layout.size - 1):
+        squares, side = layout.decode(index)
+        assert layout.index(squares, side) == index
+
+
+def test_dependencies():
+    assert dependencies("KRvK") == []
+    assert dependencies("KPvK") == ["KQvK", "KRvK"]
+
+
+def test_probe_mate_and_symmetry(tablebases):
+    assert tablebases.available() == ["KRvK"]
+    assert tablebases.probe(Board.from_fen("k7/8/1K6/8/8/8/8/7R w - - 0 1")) == (WIN, 1)
+    assert tablebases.probe(Board.from_fen("k6R/8/1K6/8/8/8/8/8 b - - 0 1")) == (LOSS, 0)
+    # Mirrored, and with the colours swapped.
+    assert tablebases.probe(Board.from_fen("7k/8/6K1/8/8/8/8/R7 w - - 0 1")) == (WIN, 1)
+    assert tablebases.probe(Board.from_fen("7r/8/8/8/8/1k6/8/K7 b - - 0 1")) == (WIN, 1)
+    assert tablebases.probe(Board.from_fen("8/8/8/8/8/8/8/k1K5 w - - 0 1")) == (DRAW, 0)
+    assert tablebases.probe(Board.from_fen("8/8/8/4q3/8/8/8/k1K5 w - - 0 1")) is None
+
+
+def test_best_move_and_engine(tablebases):
+    board = Board.from_fen("k7/8/1K6/8/8/8/8/7R w - - 0 1")
+    move, entry = tablebases.best_move(board)
+    assert move_name(move) == "h1h8" and entry == (WIN, 1)
+
+    result = Engine(hash_mb=1, tablebases=tablebases).search(board, time_limit=0, max_depth=3)
+    assert move_name(result.move) == "h1h8"
+    assert result.score == MATE - 1
+
+    # KRvKP has no table, but capturing the pawn reaches one inside the search.
+    board = Board.from_fen("8/8/8/3k4/8/8/p7/R3K3 w - - 0 1")
+    engine = Engine(hash_mb=1, tablebases=tablebases)
+    result = engine.search(board, time_limit=0, max_depth=2)
+    assert move_name(result.move) == "a1a2"
+    assert result.score > MATE - 100 and engine.stats()["tb_hits"] > 0
+
+
+def test_checkmate_uses_tablebases(tablebases):
+    board = Board.from_fen("k6R/8/1K6/8/8/8/8/8 b - - 0 1")
+    Rules.tablebases = tablebases
+    try:
+        assert Rules.is_checkmate(board, board.find_king("black"), "black")
+        board = Board.from_fen("k7/7R/1K6/8/8/8/8/8 b - - 0 1")
+        assert not Rules.is_checkmate(board, board.find_king("black"), "black")
+    finally:
+        Rules.tablebases = None
+
+
+def test_tables_agree_with_search(tablebases):
+    checked, mismatches = verify(tablebases, "KRvK", samples=10, max_plies=3)
+    assert checked == 10
+    assert mismatches == []
@@ -0,0 +1,46 @@
+import io
+import json
+
+import pytest
+
+from chess.tournament import parse_spec, run_tournament, schedule, score
+
+
+def test_parse_spec():
+    spec = parse_spec("depth=3,hash=4,plain")
+    assert (spec.depth, spec.hash, spec.plain, spec.time) == (3, 4, True, 0.1)
+    assert parse_spec("plain=true").plain and not parse_spec("plain=0").plain and not parse_spec("plain=False").plain
+    for text in ("speed=11", "plain=maybe"):
+        with pytest.raises(ValueError):
+            parse_spec(text)
+
+
+def test_schedule_pairs_colours():
+    first, second = parse_spec("depth=1"), parse_spec("depth=2")
+    jobs = schedule(["a", "b", "c"], first, second, 6, seed=1)
+    assert [job[0] for job in jobs] == [1, 2, 3, 4, 5, 6]
+    for white, black in zip(jobs[::2], jobs[1::2]):
+        assert white[1] == black[1] and white[2:] == black[2:][::-1]
+    assert sorted(job[1] for job in jobs[::2]) == ["a", "b", "c"]
+
+
+def test_score_and_error_bars():
+    results = [{"white": "a", "result": "1-0"}, {"white": "b", "result": "1-0"},
+               {"white": "a", "result": "1/2-1/2"}, {"white": "b", "result": "0-1"}]
+    current = score(results, "a")
+    assert (current.wins, current.draws, current.losses) == (2, 1, 1)
+    assert current.elo == pytest.approx(88.7, abs=0.1)
+    assert current.margin > 0
+    assert score(results[:1] + results[3:], "b").elo < -1000
+
+
+def test_tournament_writes_results(tmp_path):
+    openings = tmp_path / "openings.epd"
+    openings.write_text("k7/8/1K6/8/8/8/8/7R w - - 0 1\n6rk/8/8/8/8/8/8/K7 b - - 0 1\n")
+    out = io.StringIO()
+    final, results = run_tournament(parse_spec("depth=2"), parse_spec("depth=1"), 4, str(openings), workers=1,
+                                    out=out, max_plies=20)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(lines) == len(results) == final.games == 4
+    assert {line["game"] for line in lines} == {1, 2, 3, 4}
+    assert all(line["reason"] for line in lines)
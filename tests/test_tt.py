@@ -0,0 +1,22 @@
+from chess.tt import TranspositionTable, EXACT, LOWER
+
+
+def test_store_and_probe():
+    tt = TranspositionTable(size_mb=1)
+    tt.store(0x1234, 5, -250, EXACT, 777)
+    assert tt.probe(0x1234) == (5, -250, EXACT, 777)
+    assert tt.probe(0x4321) is None
+    assert tt.hits == 1 and tt.misses == 1
+
+
+def test_depth_preferred_bucket():
+    tt = TranspositionTable(size_mb=1)
+    stride = tt.buckets
+    tt.store(1, 8, 10, EXACT, 1)
+    tt.store(1 + stride, 2, 20, LOWER, 2)
+    tt.store(1 + 2 * stride, 3, 30, LOWER, 3)
+    assert tt.probe(1) == (8, 10, EXACT, 1)
+    assert tt.probe(1 + stride) is None
+    assert tt.probe(1 + 2 * stride) == (3, 30, LOWER, 3)
+    assert tt.overwrites == 1
+    assert tt.stats()["size_bytes"] == 1024 * 1024